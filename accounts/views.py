@@ -13,6 +13,10 @@ from config import RATE_LIMIT, FILES_LIMIT, SCRIPT_VERSION
 class GlobalVars:
     @staticmethod
     def get_globals(request):
+        # Built once per request, later calls reuse it
+        if hasattr(request, '_globals'):
+            return request._globals
+
         lang_iso = Utils.get_language(request)
         # Utils.clear_cache()
         languages = cache.get('languages')
@@ -27,14 +31,18 @@ class GlobalVars:
         except:
             lang = languages.get(iso='en')
 
-        request.session['lang'] = lang.iso
+        # Only remember an explicit ?lang= choice, otherwise every
+        # cookie-less visitor would get a session row created
+        if 'lang' in request.GET and request.session.get('lang') != lang.iso:
+            request.session['lang'] = lang.iso
 
-        return {
+        request._globals = {
             'lang': lang,
             'i18n': Translation.get_text_by_lang(lang.iso),
             'languages': languages,
             'scripts_version': SCRIPT_VERSION,
         }
+        return request._globals
 class RateLimit(APIView):
     def post(self, request):
         ip = Utils.get_ip(request)
@@ -1,6 +1,48 @@
+import sys
+import threading
+import importlib
+
 from django.apps import AppConfig
 
 
+# Service getters each worker queue's jobs use, as (module, getter) under
+# animator.services; a getter of None just imports the module
+QUEUE_WARMUP = {
+    'high': [('renderer', None)],
+    'gpu': [('image_generation', 'get_image_generator'), ('voice_synthesis', 'get_voice_synthesizer'),
+            ('renderer', None)],
+    'cpu_heavy': [('image_processing', 'get_image_processor'), ('pose_detection', 'get_pose_detector')],
+    'cpu_light': [('motion_generation', 'get_motion_generator'), ('lipsync', 'get_lipsync_generator'),
+                  ('renderer', None)],
+}
+
+
+def _warm_services(queues):
+    """Load the models and compile the kernels the given queues' jobs need."""
+    seen = set()
+    for queue in queues:
+        for module_name, getter in QUEUE_WARMUP.get(queue, []):
+            if (module_name, getter) in seen:
+                continue
+            seen.add((module_name, getter))
+
+            try:
+                module = importlib.import_module(f'animator.services.{module_name}')
+                if getter:
+                    getattr(module, getter)()
+            except Exception as e:
+                print(f"Could not warm {module_name}: {e}")
+
+
 class AnimatorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'animator'
+
+    def ready(self):
+        # RQ workers load their models at boot rather than in their first job
+        if len(sys.argv) > 1 and sys.argv[1].startswith('rqworker'):
+            queues = [arg for arg in sys.argv[2:] if arg in QUEUE_WARMUP]
+            if queues:
+                threading.Thread(
+                    target=_warm_services, args=(queues,), name='animator-warmup', daemon=True
+                ).start()
@@ -0,0 +1,44 @@
+"""
+Management command to build an INT8-quantized copy of the ONNX pose model.
+Run with: python manage.py quantize_pose_model [--output path]
+"""
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Quantize the ONNX pose landmark model weights to INT8 for CPU inference'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--input', help='FP32 model (defaults to POSE_ONNX_MODEL)')
+        parser.add_argument('--output', help='Quantized model (defaults to POSE_ONNX_MODEL_INT8)')
+
+    def handle(self, *args, **options):
+        try:
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+        except ImportError:
+            raise CommandError('onnxruntime is not installed')
+
+        model_path = options['input'] or getattr(
+            settings, 'POSE_ONNX_MODEL',
+            os.path.join(settings.BASE_DIR, 'models', 'pose_landmark_full.onnx')
+        )
+        if not os.path.exists(model_path):
+            raise CommandError(f'Model not found: {model_path}')
+
+        output_path = (
+            options['output']
+            or getattr(settings, 'POSE_ONNX_MODEL_INT8', None)
+            or os.path.splitext(model_path)[0] + '.int8.onnx'
+        )
+
+        quantize_dynamic(model_path, output_path, weight_type=QuantType.QInt8)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {output_path} ({os.path.getsize(output_path) / 1e6:.1f} MB, '
+            f'from {os.path.getsize(model_path) / 1e6:.1f} MB)'
+        ))
+        if not getattr(settings, 'POSE_ONNX_MODEL_INT8', None):
+            self.stdout.write(f"Set POSE_ONNX_MODEL_INT8 = '{output_path}' in config.py to use it")
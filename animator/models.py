@@ -1,9 +1,15 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.conf import settings
+from django.core.cache import cache
 import uuid
 import os
 
 
+SYSTEM_PRESETS_CACHE_KEY = 'animator:motion_presets:system'
+
+
 def upload_drawing_path(instance, filename):
     """Generate path for uploaded drawings"""
     ext = filename.split('.')[-1]
@@ -204,6 +210,29 @@ class MotionPreset(models.Model):
     def __str__(self):
         return f"{self.name} ({self.category})"
 
+    @classmethod
+    def system_presets(cls):
+        """System presets, cached until one is saved or deleted."""
+        return cache.get_or_set(
+            SYSTEM_PRESETS_CACHE_KEY, lambda: list(cls.objects.filter(is_system=True)), 3600
+        )
+
+    @classmethod
+    def available_to(cls, user):
+        """System presets plus, for a logged-in user, their own, ordered by category and name."""
+        presets = cls.system_presets()
+        if user.is_authenticated:
+            presets = sorted(
+                presets + list(cls.objects.filter(user=user, is_system=False)),
+                key=lambda preset: (preset.category, preset.name),
+            )
+        return presets
+
+
+@receiver([post_save, post_delete], sender=MotionPreset)
+def _invalidate_system_presets(sender, instance, **kwargs):
+    cache.delete(SYSTEM_PRESETS_CACHE_KEY)
+
 
 class Scene(models.Model):
     """A scene in the animation project"""
@@ -220,7 +249,8 @@ class Scene(models.Model):
     background = models.ForeignKey(Background, on_delete=models.SET_NULL, null=True, blank=True)
     background_color = models.CharField(max_length=7, default='#FFFFFF')  # Hex color
 
-    # Camera settings
+    # Camera settings, zoom is kept above MIN_CAMERA_ZOOM
+    MIN_CAMERA_ZOOM = 0.001
     camera_zoom = models.FloatField(default=1.0)
     camera_x = models.FloatField(default=0.0)
     camera_y = models.FloatField(default=0.0)
@@ -255,6 +285,8 @@ class SceneCharacter(models.Model):
     enter_time = models.FloatField(default=0.0)
     exit_time = models.FloatField(null=True, blank=True)  # null = stays until scene ends
 
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         ordering = ['z_index']
 
@@ -294,6 +326,7 @@ class Animation(models.Model):
     motion_prompt = models.TextField(blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['start_time']
@@ -361,6 +394,7 @@ class TextOverlay(models.Model):
     duration = models.FloatField(default=3.0)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
 
 class Export(models.Model):
@@ -413,6 +447,8 @@ class Export(models.Model):
 
     # Credits used for this export
     credits_used = models.IntegerField(default=0)
+    # Taken from the user while rendering, given back if the render never finishes
+    credits_reserved = models.IntegerField(default=0)
 
     class Meta:
         ordering = ['-created_at']
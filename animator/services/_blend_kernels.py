@@ -0,0 +1,45 @@
+"""
+JIT-compiled pixel kernels for the renderer.
+Numba is optional; alpha_over_u8 is None when it is not installed and the
+renderer falls back to its NumPy implementation.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    # Not parallel=True: frames are already rendered in a process pool, and
+    # numba's thread pool does not survive the fork into those workers
+    @njit(fastmath=True, cache=True)
+    def alpha_over_u8(canvas, overlay, ox1, oy1, x1, y1, w, h):
+        """
+        Blend a BGRA overlay region onto a BGR/BGRA canvas in place.
+        Same math as the NumPy path: (a*o + (255-a)*c + 127) // 255.
+        """
+        merge_alpha = canvas.shape[2] == 4
+        for y in range(h):
+            for x in range(w):
+                a = np.int32(overlay[oy1 + y, ox1 + x, 3])
+                if a == 0:
+                    continue
+                inv = 255 - a
+                for c in range(3):
+                    canvas[y1 + y, x1 + x, c] = (
+                        a * overlay[oy1 + y, ox1 + x, c] + inv * canvas[y1 + y, x1 + x, c] + 127
+                    ) // 255
+                if merge_alpha and a > canvas[y1 + y, x1 + x, 3]:
+                    canvas[y1 + y, x1 + x, 3] = a
+
+    # Compile now so the first rendered frame doesn't pay for it
+    for _channels in (3, 4):
+        alpha_over_u8(
+            np.zeros((2, 2, _channels), dtype=np.uint8),
+            np.full((2, 2, 4), 128, dtype=np.uint8),
+            0, 0, 0, 0, 2, 2,
+        )
+else:
+    alpha_over_u8 = None
@@ -2,6 +2,7 @@
 Image generation service for backgrounds using Stable Diffusion.
 """
 import os
+import functools
 import uuid
 from django.conf import settings
 
@@ -182,3 +183,9 @@ class ImageGenerator:
             self._generate_placeholder(prompt, size, size, output_path)
 
         return output_path
+
+
+@functools.lru_cache(maxsize=1)
+def get_image_generator() -> ImageGenerator:
+    """ImageGenerator shared by every job run in this worker process."""
+    return ImageGenerator()
@@ -3,6 +3,7 @@ Lip sync generation service.
 Analyzes audio to generate phoneme timing for lip animation.
 """
 import os
+import functools
 import json
 from typing import List, Dict
 
@@ -70,6 +71,11 @@ class LipSyncGenerator:
         'fv': {'openness': 0.1, 'width': 0.6, 'roundness': 0.0},
     }
 
+    # Amplitude-based visemes: RMS below each threshold maps to the viseme at
+    # the same index, louder than all of them to the last one
+    RMS_THRESHOLDS = (0.05, 0.15, 0.3, 0.5)
+    RMS_VISEMES = ('rest', 'closed', 'teeth', 'wide', 'open')
+
     def __init__(self):
         self.aligner = None
         self._init_aligner()
@@ -125,33 +131,27 @@ class LipSyncGenerator:
             window_size = int(sample_rate * 0.05)  # 50ms windows
             hop_size = int(sample_rate * 0.02)  # 20ms hops
 
-            phoneme_data = []
-            current_time = 0
-
-            for i in range(0, len(audio_data) - window_size, hop_size):
-                window = audio_data[i:i + window_size]
-                rms = np.sqrt(np.mean(window ** 2))
-
-                # Map RMS to viseme
-                if rms < 0.05:
-                    viseme = 'rest'
-                elif rms < 0.15:
-                    viseme = 'closed'
-                elif rms < 0.3:
-                    viseme = 'teeth'
-                elif rms < 0.5:
-                    viseme = 'wide'
-                else:
-                    viseme = 'open'
-
-                phoneme_data.append({
-                    'time': current_time,
-                    'duration': hop_size / sample_rate,
+            # Window sums of squares from one cumulative sum instead of per-window slices
+            starts = np.arange(0, max(len(audio_data) - window_size, 0), hop_size)
+            squares = np.concatenate(([0.0], np.cumsum(audio_data ** 2)))
+            window_energy = np.maximum(squares[starts + window_size] - squares[starts], 0)
+            rms = np.sqrt(window_energy / window_size)
+
+            # Map RMS to viseme
+            visemes = np.array(self.RMS_VISEMES)[
+                np.searchsorted(self.RMS_THRESHOLDS, rms, side='right')
+            ]
+
+            hop_duration = hop_size / sample_rate
+            phoneme_data = [
+                {
+                    'time': i * hop_duration,
+                    'duration': hop_duration,
                     'phoneme': 'SIL' if viseme == 'rest' else 'AH',
                     'viseme': viseme,
-                })
-
-                current_time += hop_size / sample_rate
+                }
+                for i, viseme in enumerate(visemes.tolist())
+            ]
 
             # Smooth transitions
             phoneme_data = self._smooth_visemes(phoneme_data)
@@ -242,3 +242,9 @@ class LipSyncGenerator:
             'width': shape1['width'] * (1 - t) + shape2['width'] * t,
             'roundness': shape1['roundness'] * (1 - t) + shape2['roundness'] * t,
         }
+
+
+@functools.lru_cache(maxsize=1)
+def get_lipsync_generator() -> LipSyncGenerator:
+    """LipSyncGenerator shared by every job run in this worker process."""
+    return LipSyncGenerator()
@@ -5,6 +5,7 @@ Generates animation data from text prompts or motion capture data.
 import numpy as np
 import json
 import os
+import functools
 from typing import Optional
 
 
@@ -506,3 +507,9 @@ class MotionGenerator:
             return abs(head.get('y', 0) - ankle.get('y', 0))
 
         return 500  # Default height
+
+
+@functools.lru_cache(maxsize=1)
+def get_motion_generator() -> MotionGenerator:
+    """MotionGenerator shared by every job run in this worker process."""
+    return MotionGenerator()
@@ -1,11 +1,71 @@
 """
 Pose detection service using open source models.
-Uses MediaPipe for fast pose detection or OpenPose for more accuracy.
+Uses MediaPipe for fast pose detection, an ONNX export of the pose landmark
+model via onnxruntime when MediaPipe is not installed, and contour analysis
+as a last resort.
 """
+import os
+import atexit
+import functools
+import threading
 import cv2
 import numpy as np
 from PIL import Image
 import json
+from django.conf import settings
+
+# Input resolution of the BlazePose landmark model
+ONNX_INPUT_SIZE = 256
+
+
+# MediaPipe Pose graphs keyed by (static_image_mode, model_complexity, min_detection_confidence)
+_pose_cache = {}
+
+
+def _cached_pose(static_image_mode, model_complexity, min_detection_confidence):
+    """
+    Shared MediaPipe Pose graph per configuration.
+    Building one allocates a TFLite interpreter, so workers keep it for their lifetime.
+    """
+    key = (static_image_mode, model_complexity, min_detection_confidence)
+    if key not in _pose_cache:
+        import mediapipe as mp
+        _pose_cache[key] = mp.solutions.pose.Pose(
+            static_image_mode=static_image_mode,
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence
+        )
+    return _pose_cache[key]
+
+
+@atexit.register
+def _close_cached_poses():
+    """Release MediaPipe graphs on interpreter shutdown."""
+    for pose in _pose_cache.values():
+        pose.close()
+    _pose_cache.clear()
+
+
+@functools.lru_cache(maxsize=2)
+def _cached_ort_session(model_path):
+    """Shared onnxruntime session per model file."""
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = os.cpu_count() or 1
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+    available = ort.get_available_providers()
+    providers = [
+        p for p in ('CUDAExecutionProvider', 'CPUExecutionProvider')
+        if p in available
+    ]
+    return ort.InferenceSession(model_path, sess_options=options, providers=providers)
+
+
+def _has_cuda_provider():
+    import onnxruntime as ort
+    return 'CUDAExecutionProvider' in ort.get_available_providers()
 
 
 class PoseDetector:
@@ -42,9 +102,43 @@ class PoseDetector:
         ('right_knee', 'right_ankle'),
     ]
 
+    # MediaPipe landmark index -> our joint name
+    LANDMARK_MAPPING = {
+        0: 'nose',
+        2: 'left_eye',
+        5: 'right_eye',
+        7: 'left_ear',
+        8: 'right_ear',
+        11: 'left_shoulder',
+        12: 'right_shoulder',
+        13: 'left_elbow',
+        14: 'right_elbow',
+        15: 'left_wrist',
+        16: 'right_wrist',
+        23: 'left_hip',
+        24: 'right_hip',
+        25: 'left_knee',
+        26: 'right_knee',
+        27: 'left_ankle',
+        28: 'right_ankle',
+    }
+
+    # Row indices into the (len(HUMANOID_JOINTS), 3) x/y/visibility array
+    _LANDMARK_SRC = np.array(list(LANDMARK_MAPPING.keys()))
+    _LANDMARK_DST = np.array(list(map(HUMANOID_JOINTS.index, LANDMARK_MAPPING.values())))
+    _SHOULDERS = [HUMANOID_JOINTS.index('left_shoulder'), HUMANOID_JOINTS.index('right_shoulder')]
+    _HIPS = [HUMANOID_JOINTS.index('left_hip'), HUMANOID_JOINTS.index('right_hip')]
+    _NOSE = [HUMANOID_JOINTS.index('nose')]
+    _DERIVED = list(map(HUMANOID_JOINTS.index, ('neck', 'pelvis', 'head_top')))
+    _DERIVED_OFFSET = np.array([[0, -20], [0, 0], [0, -50]])
+
     def __init__(self):
         self.mp_pose = None
         self.pose = None
+        self.ort_session = None
+        self.onnx_quantized = False
+        # Per-thread grayscale/threshold scratch buffers, reused across images of the same size
+        self._buffers = threading.local()
         self._init_mediapipe()
 
     def _init_mediapipe(self):
@@ -52,13 +146,53 @@ class PoseDetector:
         try:
             import mediapipe as mp
             self.mp_pose = mp.solutions.pose
-            self.pose = self.mp_pose.Pose(
+            self.pose = _cached_pose(
                 static_image_mode=True,
                 model_complexity=2,
                 min_detection_confidence=0.5
             )
         except ImportError:
-            print("MediaPipe not available, using fallback detection")
+            print("MediaPipe not available, trying ONNX pose model")
+            self._init_onnx()
+
+    def _init_onnx(self):
+        """Initialize onnxruntime session for the exported pose landmark model"""
+        model_path = getattr(
+            settings, 'POSE_ONNX_MODEL',
+            os.path.join(settings.BASE_DIR, 'models', 'pose_landmark_full.onnx')
+        )
+        int8_path = getattr(settings, 'POSE_ONNX_MODEL_INT8', None)
+
+        try:
+            # Prefer the INT8-quantized export on CPU-only hosts, keeping the
+            # full-precision model as the fallback
+            if int8_path and os.path.exists(int8_path) and not _has_cuda_provider():
+                try:
+                    self.ort_session = _cached_ort_session(int8_path)
+                    self.onnx_quantized = True
+                    return
+                except ImportError:
+                    raise
+                except Exception as e:
+                    print(f"Error loading INT8 pose model, using full precision: {e}")
+
+            if not model_path or not os.path.exists(model_path):
+                print("ONNX pose model not found, using fallback detection")
+                return
+
+            self.ort_session = _cached_ort_session(model_path)
+        except ImportError:
+            print("onnxruntime not available, using fallback detection")
+        except Exception as e:
+            print(f"Error loading ONNX pose model: {e}")
+
+    @property
+    def detection_method(self) -> str:
+        if self.pose:
+            return 'mediapipe'
+        if self.ort_session:
+            return 'onnx_int8' if self.onnx_quantized else 'onnx'
+        return 'contour'
 
     def detect(self, image_path: str) -> dict:
         """
@@ -70,76 +204,33 @@ class PoseDetector:
         Returns:
             dict: Rig data with joints and bones
         """
-        # Load image
+        return self._detect_image(*self._load_image(image_path))
+
+    def _load_image(self, image_path: str) -> tuple:
+        """Load image as BGR plus the RGB copy MediaPipe/ONNX expect."""
         image = cv2.imread(image_path)
         if image is None:
             raise ValueError(f"Could not load image: {image_path}")
 
-        height, width = image.shape[:2]
-
         # Convert to RGB for MediaPipe
         image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return image, image_rgb
 
-        joints = {}
+    def _detect_image(self, image: np.ndarray, image_rgb: np.ndarray) -> dict:
+        """Detect pose on an already loaded image."""
+        height, width = image.shape[:2]
 
         if self.pose:
             # Use MediaPipe for detection
             results = self.pose.process(image_rgb)
 
+            joints = {}
             if results.pose_landmarks:
-                landmarks = results.pose_landmarks.landmark
-
-                # Map MediaPipe landmarks to our joint names
-                landmark_mapping = {
-                    0: 'nose',
-                    2: 'left_eye',
-                    5: 'right_eye',
-                    7: 'left_ear',
-                    8: 'right_ear',
-                    11: 'left_shoulder',
-                    12: 'right_shoulder',
-                    13: 'left_elbow',
-                    14: 'right_elbow',
-                    15: 'left_wrist',
-                    16: 'right_wrist',
-                    23: 'left_hip',
-                    24: 'right_hip',
-                    25: 'left_knee',
-                    26: 'right_knee',
-                    27: 'left_ankle',
-                    28: 'right_ankle',
-                }
-
-                for idx, joint_name in landmark_mapping.items():
-                    if idx < len(landmarks):
-                        landmark = landmarks[idx]
-                        joints[joint_name] = {
-                            'x': landmark.x * width,
-                            'y': landmark.y * height,
-                            'visibility': landmark.visibility
-                        }
-
-                # Calculate derived joints
-                if 'left_shoulder' in joints and 'right_shoulder' in joints:
-                    joints['neck'] = {
-                        'x': (joints['left_shoulder']['x'] + joints['right_shoulder']['x']) / 2,
-                        'y': (joints['left_shoulder']['y'] + joints['right_shoulder']['y']) / 2 - 20,
-                        'visibility': 1.0
-                    }
-
-                if 'left_hip' in joints and 'right_hip' in joints:
-                    joints['pelvis'] = {
-                        'x': (joints['left_hip']['x'] + joints['right_hip']['x']) / 2,
-                        'y': (joints['left_hip']['y'] + joints['right_hip']['y']) / 2,
-                        'visibility': 1.0
-                    }
-
-                if 'nose' in joints:
-                    joints['head_top'] = {
-                        'x': joints['nose']['x'],
-                        'y': joints['nose']['y'] - 50,
-                        'visibility': 1.0
-                    }
+                landmarks = self._read_landmarks(results.pose_landmarks.landmark)
+                joints = self._landmarks_to_joints(landmarks, width, height)
+        elif self.ort_session:
+            landmarks = self._detect_onnx(image_rgb)
+            joints = self._landmarks_to_joints(landmarks, width, height)
         else:
             # Fallback: estimate pose from image contours
             joints = self._fallback_detection(image)
@@ -150,11 +241,100 @@ class PoseDetector:
             'bones': self.HUMANOID_BONES,
             'image_size': {'width': width, 'height': height},
             'character_type': 'humanoid',
-            'detection_method': 'mediapipe' if self.pose else 'contour'
+            'detection_method': self.detection_method
         }
 
         return rig_data
 
+    def _read_landmarks(self, landmark_list) -> np.ndarray:
+        """
+        Read MediaPipe landmarks into an (n, 3) x/y/visibility array.
+        Only mapped landmarks are read, each proto field once; the rest stay NaN.
+        """
+        count = len(landmark_list)
+        idxs = self._LANDMARK_SRC[self._LANDMARK_SRC < count]
+
+        landmarks = np.full((count, 3), np.nan)
+        landmarks[idxs] = np.fromiter(
+            (
+                (landmark.x, landmark.y, landmark.visibility)
+                for landmark in map(landmark_list.__getitem__, idxs.tolist())
+            ),
+            dtype=np.dtype((np.float64, 3)),
+            count=len(idxs),
+        )
+        return landmarks
+
+    def _landmarks_to_joints(self, landmarks: np.ndarray, width: int, height: int) -> dict:
+        """
+        Convert normalized (n, 3) x/y/visibility landmarks to joint dict.
+        Missing joints are NaN rows, so derived joints inherit NaN instead of
+        needing a presence check, and are dropped when building the dict.
+        """
+        xyv = np.full((len(self.HUMANOID_JOINTS), 3), np.nan)
+
+        valid = self._LANDMARK_SRC < len(landmarks)
+        xyv[self._LANDMARK_DST[valid]] = landmarks[self._LANDMARK_SRC[valid]]
+        xyv[:, 0] *= width
+        xyv[:, 1] *= height
+
+        # Derived joints: neck, pelvis, head_top
+        derived = np.stack([
+            xyv[self._SHOULDERS, :2].mean(axis=0),
+            xyv[self._HIPS, :2].mean(axis=0),
+            xyv[self._NOSE, :2].mean(axis=0),
+        ]) + self._DERIVED_OFFSET
+        xyv[self._DERIVED, :2] = derived
+        # Full visibility for derived joints, NaN carried through when a source is missing
+        xyv[self._DERIVED, 2] = derived[:, 0] * 0 + 1.0
+
+        detected = ~np.isnan(xyv[:, 0])
+        return {
+            self.HUMANOID_JOINTS[i]: {'x': x, 'y': y, 'visibility': v}
+            for i, (x, y, v) in zip(np.flatnonzero(detected).tolist(), xyv[detected].tolist())
+        }
+
+    def _detect_onnx(self, image_rgb: np.ndarray) -> np.ndarray:
+        """
+        Run the ONNX pose landmark model.
+        The model emits (x, y, z, visibility, presence) in input pixels; returns
+        normalized (n, 3) x/y/visibility like MediaPipe.
+        """
+        model_input = self.ort_session.get_inputs()[0]
+        resized = cv2.resize(image_rgb, (ONNX_INPUT_SIZE, ONNX_INPUT_SIZE))
+        tensor = resized.astype(np.float32) / 255.0
+
+        # Exports differ in layout: NCHW has channels in dim 1
+        if model_input.shape[1] == 3:
+            tensor = tensor.transpose(2, 0, 1)
+        tensor = tensor[np.newaxis]
+
+        output = self.ort_session.run(None, {model_input.name: tensor})[0]
+        landmarks = output.reshape(-1, 5)
+
+        return np.column_stack([
+            landmarks[:, 0] / ONNX_INPUT_SIZE,
+            landmarks[:, 1] / ONNX_INPUT_SIZE,
+            1.0 / (1.0 + np.exp(-landmarks[:, 3])),
+        ])
+
+    def _get_buffer(self, name: str, shape: tuple) -> np.ndarray:
+        """Return a reusable uint8 buffer, reallocated only when the shape changes."""
+        buf = getattr(self._buffers, name, None)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=np.uint8)
+            setattr(self._buffers, name, buf)
+        return buf
+
+    def _threshold(self, image: np.ndarray) -> np.ndarray:
+        """Binary mask of non-white pixels, written into pooled buffers."""
+        shape = image.shape[:2]
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=self._get_buffer('gray', shape))
+        _, thresh = cv2.threshold(
+            gray, 240, 255, cv2.THRESH_BINARY_INV, dst=self._get_buffer('thresh', shape)
+        )
+        return thresh
+
     def _fallback_detection(self, image: np.ndarray) -> dict:
         """
         Fallback pose detection using contour analysis.
@@ -162,11 +342,8 @@ class PoseDetector:
         """
         height, width = image.shape[:2]
 
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-
-        # Threshold
-        _, thresh = cv2.threshold(gray, 240, 255, cv2.THRESH_BINARY_INV)
+        # Grayscale + threshold
+        thresh = self._threshold(image)
 
         # Find contours
         contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -235,8 +412,7 @@ class PoseDetector:
         height, width = image.shape[:2]
 
         # For quadrupeds, use contour-based detection
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        _, thresh = cv2.threshold(gray, 240, 255, cv2.THRESH_BINARY_INV)
+        thresh = self._threshold(image)
         contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
         if not contours:
@@ -304,3 +480,9 @@ class PoseDetector:
             'character_type': 'quadruped',
             'detection_method': 'default'
         }
+
+
+@functools.lru_cache(maxsize=1)
+def get_pose_detector() -> PoseDetector:
+    """PoseDetector shared by every job run in this worker process."""
+    return PoseDetector()
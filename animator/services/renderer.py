@@ -7,10 +7,205 @@ import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import os
 import uuid
+import functools
+import hashlib
+import json
+import shutil
 import subprocess
 import tempfile
+import time
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from typing import Callable, Optional
 from django.conf import settings
+from django.db import connections
+from django.db.models import Prefetch
+
+from ._blend_kernels import alpha_over_u8
+
+
+FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+# H.264 hardware encoders in order of preference: NVIDIA, Intel QuickSync, VAAPI (AMD/Intel)
+HW_ENCODERS = ('h264_nvenc', 'h264_qsv', 'h264_vaapi')
+VAAPI_DEVICE = '/dev/dri/renderD128'
+
+# cv2.rotate codes by number of counter-clockwise quarter turns, matching
+# the direction of positive angles in cv2.getRotationMatrix2D
+QUARTER_TURNS = {1: cv2.ROTATE_90_COUNTERCLOCKWISE, 2: cv2.ROTATE_180, 3: cv2.ROTATE_90_CLOCKWISE}
+
+
+def _hw_encoder_args(encoder: str, crf: int) -> tuple:
+    """FFmpeg (pre-input, video filter, output) arguments for a hardware H.264 encoder."""
+    if encoder == 'h264_nvenc':
+        return [], [], ['-c:v', 'h264_nvenc', '-preset', 'p4', '-tune', 'hq',
+                        '-rc', 'vbr', '-cq', str(crf), '-b:v', '0', '-pix_fmt', 'yuv420p']
+    if encoder == 'h264_qsv':
+        return [], [], ['-c:v', 'h264_qsv', '-global_quality', str(crf), '-pix_fmt', 'nv12']
+    if encoder == 'h264_vaapi':
+        return (['-vaapi_device', VAAPI_DEVICE], ['format=nv12', 'hwupload'],
+                ['-c:v', 'h264_vaapi', '-qp', str(crf)])
+    raise ValueError(f"Unknown hardware encoder: {encoder}")
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_hw_encoder() -> Optional[str]:
+    """
+    First hardware H.264 encoder FFmpeg can actually open on this host.
+    Builds often list encoders without the GPU or driver present, so each
+    candidate is tried on a single test frame. Cached for the process lifetime.
+    """
+    try:
+        listing = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                 capture_output=True, text=True, timeout=30).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+    for encoder in HW_ENCODERS:
+        if encoder not in listing:
+            continue
+        pre_input, filters, output = _hw_encoder_args(encoder, 23)
+        if filters:
+            output = ['-vf', ','.join(filters)] + output
+        try:
+            result = subprocess.run(
+                ['ffmpeg', '-hide_banner'] + pre_input +
+                ['-f', 'lavfi', '-i', 'color=size=256x256', '-frames:v', '1'] +
+                output + ['-f', 'null', '-'],
+                capture_output=True, timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        if result.returncode == 0:
+            return encoder
+
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_hex_color(hex_color: str) -> tuple:
+    """Parse a #RRGGBB color into an RGB tuple, once per distinct string."""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+
+@functools.lru_cache(maxsize=64)
+def _load_cached_image(path: str) -> Optional[np.ndarray]:
+    """
+    Decode an image once per process.
+    Marked read-only since every caller shares the same array; the
+    transform steps (flip, resize, warpAffine) all allocate their output.
+    """
+    image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    if image is not None:
+        image.setflags(write=False)
+    return image
+
+
+# Hard-mask classification of shared images by id, see _has_hard_mask
+_hard_mask_cache = {}
+
+
+def _has_hard_mask(image: np.ndarray) -> bool:
+    """
+    Whether a BGRA image's alpha is only ever 0 or 255. Only the shared
+    read-only images from _load_cached_image are classified, once each;
+    per-frame arrays (warped, flipped, faded) always report False.
+    """
+    if image.flags.writeable:
+        return False
+
+    key = id(image)
+    entry = _hard_mask_cache.get(key)
+    if entry is None or entry[0]() is not image:
+        alpha = image[:, :, 3]
+        hard = not np.count_nonzero((alpha != 0) & (alpha != 255))
+        entry = (weakref.ref(image, lambda _: _hard_mask_cache.pop(key, None)), hard)
+        _hard_mask_cache[key] = entry
+
+    return entry[1]
+
+
+@functools.lru_cache(maxsize=32)
+def _load_font(font_size: int):
+    """Load the overlay font at a given size."""
+    try:
+        return ImageFont.truetype(FONT_PATH, font_size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=256)
+def _render_text_tile(text: str, font_size: int, rgb: tuple) -> tuple:
+    """
+    Rasterize text with PIL into a BGRA tile cropped to its bounding box.
+    Returns (tile, offset_x, offset_y), the offsets being where the box
+    starts relative to the draw position.
+    """
+    font = _load_font(font_size)
+    left, top, right, bottom = ImageDraw.Draw(Image.new('L', (1, 1))).textbbox(
+        (0, 0), text, font=font
+    )
+    width, height = max(right - left, 1), max(bottom - top, 1)
+
+    mask = Image.new('L', (width, height), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+
+    tile = np.empty((height, width, 4), dtype=np.uint8)
+    tile[:, :, :3] = rgb[::-1]
+    tile[:, :, 3] = np.asarray(mask)
+    tile.setflags(write=False)
+
+    return tile, left, top
+
+
+# Renderer owned by a render worker process, see _worker_init
+_worker_renderer = None
+
+
+def _worker_init(project_id):
+    """Set up a render worker process with its own renderer and image cache."""
+    global _worker_renderer
+
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+    from ..models import Project
+    _worker_renderer = AnimationRenderer(Project.objects.get(id=project_id))
+
+
+def _run_in_worker(job):
+    """Call a per-frame renderer method inside a render worker process."""
+    method, args = job
+    return getattr(_worker_renderer, method)(*args)
+
+
+def _palette_cache_dir() -> str:
+    return os.path.join(settings.MEDIA_ROOT, 'cache', 'palettes')
+
+
+def prune_palette_cache(max_age: float) -> int:
+    """Delete cached GIF palettes (and stray temp files) unused for max_age seconds."""
+    cache_dir = _palette_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    cutoff = time.time() - max_age
+    removed = 0
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
 
 
 class AnimationRenderer:
@@ -19,11 +214,12 @@ class AnimationRenderer:
     Uses OpenCV for frame rendering and FFmpeg for video encoding.
     """
 
+    # bitrate is used for VP9, preset/crf for x264 (constant quality, no bitrate cap)
     QUALITY_SETTINGS = {
-        'low': {'width': 854, 'height': 480, 'bitrate': '1M'},
-        'medium': {'width': 1280, 'height': 720, 'bitrate': '2.5M'},
-        'high': {'width': 1920, 'height': 1080, 'bitrate': '5M'},
-        'ultra': {'width': 3840, 'height': 2160, 'bitrate': '15M'},
+        'low': {'width': 854, 'height': 480, 'bitrate': '1M', 'preset': 'veryfast', 'crf': 23},
+        'medium': {'width': 1280, 'height': 720, 'bitrate': '2.5M', 'preset': 'faster', 'crf': 21},
+        'high': {'width': 1920, 'height': 1080, 'bitrate': '5M', 'preset': 'medium', 'crf': 19},
+        'ultra': {'width': 3840, 'height': 2160, 'bitrate': '15M', 'preset': 'slow', 'crf': 17},
     }
 
     def __init__(self, project):
@@ -39,8 +235,20 @@ class AnimationRenderer:
         self.fps = project.fps
         self.duration = project.duration_seconds
 
-        # Cache loaded images
-        self.image_cache = {}
+        # Keyframe arrays per animation id, see _keyframe_arrays
+        self._keyframe_cache = {}
+
+        # Prefetched scenes, see _scenes
+        self._scene_cache = None
+
+        # Background plus unanimated characters per scene, see _static_canvas
+        self._static_canvases = {}
+
+        # Per-scene frame closures, see _scene_renderer
+        self._scene_renderers = {}
+
+        # Reused frame buffers by channel count, see _scratch_canvas
+        self._scratch_canvases = {}
 
     def render(self, format: str = 'mp4', quality: str = 'high',
                include_audio: bool = True, transparent: bool = False,
@@ -66,29 +274,37 @@ class AnimationRenderer:
         # Calculate total frames
         total_frames = int(self.duration * self.fps)
 
+        if format not in ('gif', 'png_sequence'):
+            # Stream raw frames straight into the encoder
+            output_path = self._pipe_to_encoder(
+                total_frames, format, quality, include_audio,
+                transparent, out_width, out_height, progress_callback
+            )
+
+            if progress_callback:
+                progress_callback(100)
+
+            return output_path
+
         # Create temp directory for frames
         temp_dir = tempfile.mkdtemp()
         frames_dir = os.path.join(temp_dir, 'frames')
         os.makedirs(frames_dir)
 
         try:
-            # Render all frames
-            for frame_num in range(total_frames):
-                frame = self._render_frame_at_time(frame_num / self.fps, transparent)
-
-                # Resize if needed
-                if frame.shape[1] != out_width or frame.shape[0] != out_height:
-                    frame = cv2.resize(frame, (out_width, out_height),
-                                      interpolation=cv2.INTER_LANCZOS4)
-
-                # Save frame
-                frame_path = os.path.join(frames_dir, f'frame_{frame_num:06d}.png')
-                cv2.imwrite(frame_path, frame)
-
-                # Report progress
-                if progress_callback:
-                    render_progress = int((frame_num / total_frames) * 80)
-                    progress_callback(render_progress)
+            # Render all frames. A PNG sequence is the output itself so it is
+            # resized here; GIF frames are scaled by FFmpeg while encoding and
+            # only read back once, so they are written as uncompressed TIFF.
+            if format == 'png_sequence':
+                frame_width, frame_height, extension = out_width, out_height, 'png'
+            else:
+                frame_width, frame_height, extension = self.width, self.height, 'tiff'
+            frame_args = [
+                (frame_num, frame_width, frame_height, transparent, frames_dir, extension)
+                for frame_num in range(total_frames)
+            ]
+            for _ in self._map_frames('_write_frame', frame_args, progress_callback):
+                pass
 
             # Encode video
             output_path = self._encode_video(
@@ -103,33 +319,148 @@ class AnimationRenderer:
 
         finally:
             # Cleanup temp frames
-            import shutil
             shutil.rmtree(temp_dir, ignore_errors=True)
 
-    def render_frame(self, scene, frame_number: int) -> str:
-        """
-        Render a single frame for preview.
+    def _pipe_to_encoder(self, total_frames: int, format: str, quality: str,
+                         include_audio: bool, transparent: bool,
+                         width: int, height: int,
+                         progress_callback: Optional[Callable[[int], None]]) -> str:
+        """Render frames and write them as raw video to FFmpeg's stdin."""
+        output_path = self._get_output_path(format)
+
+        # Frames go in at project size, FFmpeg's scale filter does the resize
+        input_args = [
+            '-f', 'rawvideo',
+            '-pix_fmt', 'bgra' if transparent else 'bgr24',
+            '-s', f'{self.width}x{self.height}',
+            '-framerate', str(self.fps),
+            '-i', '-',
+        ]
+        cmd = self._video_command(input_args, format, quality, include_audio,
+                                  transparent, output_path, width, height)
+
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        # Drain stderr in the background so FFmpeg never blocks on a full pipe
+        stderr_chunks = []
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True
+        )
+        stderr_reader.start()
+
+        frame_args = [
+            (frame_num, self.width, self.height, transparent)
+            for frame_num in range(total_frames)
+        ]
+        frames = self._map_frames('_render_output_frame', frame_args, progress_callback)
+        try:
+            for frame in frames:
+                process.stdin.write(frame.tobytes())
+            process.stdin.close()
+        except BrokenPipeError:
+            # FFmpeg exited early, its return code and stderr say why
+            pass
+        except BaseException:
+            process.kill()
+            raise
+        finally:
+            frames.close()
+            process.wait()
+            stderr_reader.join()
 
-        Args:
-            scene: Scene model instance
-            frame_number: Frame number to render
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process.returncode, cmd, stderr=b''.join(stderr_chunks)
+            )
 
-        Returns:
-            str: Path to rendered frame image
+        return output_path
+
+    def _map_frames(self, method: str, frame_args: list,
+                    progress_callback: Optional[Callable[[int], None]]):
         """
-        time = frame_number / self.fps
-        frame = self._render_scene_at_time(scene, time, False)
+        Run a per-frame renderer method over frame_args, yielding results in order.
+        Frames are independent, so they are spread over a process pool when
+        more than one worker is available.
+        """
+        total_frames = len(frame_args)
+        workers = self._render_workers(total_frames)
+
+        if workers > 1:
+            # Forked workers must not share the parent's DB connection
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_worker_init,
+                                     initargs=(self.project.id,)) as executor:
+                # Only a couple of frames per worker are in flight, so a slow
+                # encoder holds rendering back instead of frames piling up here
+                pending = deque()
+                jobs = iter(frame_args)
+                try:
+                    for frame_num in range(total_frames):
+                        for args in islice(jobs, workers * 2 - len(pending)):
+                            pending.append(executor.submit(_run_in_worker, (method, args)))
+                        result = pending.popleft().result()
+                        if progress_callback:
+                            progress_callback(int((frame_num / total_frames) * 80))
+                        yield result
+                except BaseException:
+                    # A failed frame, or the encoder giving up and closing this
+                    # generator: drop the queued frames rather than render them
+                    executor.shutdown(cancel_futures=True)
+                    raise
+        else:
+            render_method = getattr(self, method)
+            for frame_num, args in enumerate(frame_args):
+                result = render_method(*args)
 
-        # Save to temp file
-        output_dir = os.path.join(settings.MEDIA_ROOT, 'temp', 'previews')
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, f'preview_{uuid.uuid4()}.png')
+                # Report progress
+                if progress_callback:
+                    render_progress = int((frame_num / total_frames) * 80)
+                    progress_callback(render_progress)
 
-        cv2.imwrite(output_path, frame)
-        return output_path
+                yield result
+
+    def _render_workers(self, total_frames: int) -> int:
+        """Number of processes to render frames with."""
+        workers = getattr(settings, 'RENDER_WORKERS', None) or os.cpu_count() or 1
+        return max(1, min(workers, total_frames))
+
+    def _render_output_frame(self, frame_num: int, out_width: int, out_height: int,
+                             transparent: bool) -> np.ndarray:
+        """Render a frame at output size, BGRA when transparent and BGR otherwise."""
+        frame = self._render_frame_at_time(frame_num / self.fps, transparent)
+
+        # Resize if needed
+        if frame.shape[1] != out_width or frame.shape[0] != out_height:
+            frame = cv2.resize(frame, (out_width, out_height),
+                               interpolation=cv2.INTER_LANCZOS4)
+
+        # Raw video needs a fixed pixel layout for every frame
+        channels = 4 if transparent else 3
+        if frame.shape[2] != channels:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2BGRA if transparent else cv2.COLOR_BGRA2BGR)
+
+        return frame
+
+    def _write_frame(self, frame_num: int, out_width: int, out_height: int,
+                     transparent: bool, frames_dir: str, extension: str = 'png'):
+        """Render a frame at output size and save it as PNG or uncompressed TIFF."""
+        frame = self._render_output_frame(frame_num, out_width, out_height, transparent)
+
+        # Save frame
+        frame_path = os.path.join(frames_dir, f'frame_{frame_num:06d}.{extension}')
+        params = [cv2.IMWRITE_TIFF_COMPRESSION, 1] if extension == 'tiff' else []
+        cv2.imwrite(frame_path, frame, params)
+
+    def render_frame_png(self, scene, frame_number: int) -> bytes:
+        """Render a single preview frame as PNG bytes, without touching disk."""
+        frame = self._render_scene_at_time(scene, frame_number / self.fps, False)
+        ok, buffer = cv2.imencode('.png', frame)
+        if not ok:
+            raise ValueError(f"Could not encode preview frame {frame_number}")
+        return buffer.tobytes()
 
     def _render_frame_at_time(self, time: float, transparent: bool) -> np.ndarray:
-        """Render complete frame at given time."""
+        """Render complete frame at given time, see _render_scene_at_time about reuse."""
         # Create canvas
         if transparent:
             canvas = np.zeros((self.height, self.width, 4), dtype=np.uint8)
@@ -138,7 +469,7 @@ class AnimationRenderer:
 
         # Find active scene at this time
         current_time = 0
-        for scene in self.project.scenes.all().order_by('order'):
+        for scene in self._scenes():
             scene_end = current_time + scene.duration
 
             if current_time <= time < scene_end:
@@ -150,67 +481,178 @@ class AnimationRenderer:
 
         return canvas
 
+    def _scenes(self) -> list:
+        """
+        Project scenes in order, loaded once per render together with their
+        background, characters (by z-index), animations and text overlays so
+        the per-frame code reads prefetched data instead of querying.
+        """
+        if self._scene_cache is None:
+            from ..models import Animation, SceneCharacter
+
+            self._scene_cache = list(
+                self.project.scenes.order_by('order')
+                .select_related('background')
+                .prefetch_related(
+                    Prefetch(
+                        'scene_characters',
+                        queryset=SceneCharacter.objects.select_related('character').order_by('z_index'),
+                    ),
+                    Prefetch(
+                        'scene_characters__animations',
+                        queryset=Animation.objects.select_related('motion_preset'),
+                    ),
+                    'text_overlays',
+                )
+            )
+
+        return self._scene_cache
+
     def _render_scene_at_time(self, scene, time: float, transparent: bool) -> np.ndarray:
-        """Render a scene at given time."""
-        # Create canvas
-        if transparent:
-            canvas = np.zeros((self.height, self.width, 4), dtype=np.uint8)
-        else:
-            # Parse background color
-            bg_color = self._hex_to_bgr(scene.background_color)
-            canvas = np.full((self.height, self.width, 3), bg_color, dtype=np.uint8)
-
-        # Draw background image if present
-        if scene.background:
-            bg_image = self._load_image(scene.background.image.path)
-            if bg_image is not None:
-                canvas = self._composite_image(canvas, bg_image, 0, 0, 1.0, 0)
-
-        # Draw characters sorted by z-index
-        for scene_char in scene.scene_characters.all().order_by('z_index'):
-            # Check if character is visible at this time
-            if time < scene_char.enter_time:
-                continue
-            if scene_char.exit_time and time >= scene_char.exit_time:
-                continue
-
-            # Get character image
-            char = scene_char.character
-            if char.processed_image:
-                char_image = self._load_image(char.processed_image.path)
-            else:
-                char_image = self._load_image(char.original_image.path)
+        """
+        Render a scene at given time. The result may be the renderer's scratch
+        canvas, which the next frame overwrites; copy it to keep it around.
+        """
+        return self._scene_renderer(scene, transparent)(time)
 
-            if char_image is None:
-                continue
+    def _scene_renderer(self, scene, transparent: bool) -> Callable[[float], np.ndarray]:
+        """
+        Frame renderer for a scene. Everything that doesn't change over time
+        (character timings and image paths, overlay windows, whether the camera
+        applies) is read once here, so the per-frame closure only checks times.
+        Built lazily per process because closures can't be sent to workers.
+        """
+        key = (scene.id, transparent)
+        if key in self._scene_renderers:
+            return self._scene_renderers[key]
+
+        # Characters sorted by z-index as (scene_char, enter, exit, animated, image path)
+        characters = [
+            (scene_char, scene_char.enter_time, scene_char.exit_time,
+             bool(scene_char.animations.all()), self._character_image_path(scene_char.character))
+            for scene_char in scene.scene_characters.all()
+        ]
+        overlays = [
+            (overlay, overlay.start_time, overlay.start_time + overlay.duration)
+            for overlay in scene.text_overlays.all()
+        ]
+        # camera_x/camera_y only move the zoom center so unit zoom is a no-op
+        needs_camera = scene.camera_zoom != 1.0
+
+        scratch = self._scratch_canvas(transparent)
+        static_canvas = self._static_canvas
+        draw_character = self._draw_character
+        render_text_overlay = self._render_text_overlay
+        apply_camera = self._apply_camera
+
+        def render_scene(time: float) -> np.ndarray:
+            # Characters visible at this time
+            visible = [
+                character for character in characters
+                if character[1] <= time and not (character[2] and time >= character[2])
+            ]
 
-            # Apply animations
-            animated_image = self._apply_animations(
-                char_image, scene_char, char.rig_data, time
-            )
+            # Characters below the first animated one look the same in every frame,
+            # so they are baked into a cached base canvas together with the background
+            static_count = 0
+            for character in visible:
+                if character[3]:
+                    break
+                static_count += 1
+
+            canvas = scratch
+            np.copyto(canvas, static_canvas(scene, transparent, visible[:static_count]))
+
+            # Draw the remaining characters on top
+            for scene_char, _, _, _, image_path in visible[static_count:]:
+                canvas = draw_character(canvas, scene_char, image_path, time)
+
+            # Draw text overlays
+            for overlay, start, end in overlays:
+                if start <= time < end:
+                    canvas = render_text_overlay(canvas, overlay, time - start)
+
+            # Apply camera
+            if needs_camera:
+                canvas = apply_camera(canvas, scene)
+
+            return canvas
 
-            # Apply flip if needed
-            if scene_char.flip_horizontal:
-                animated_image = cv2.flip(animated_image, 1)
+        self._scene_renderers[key] = render_scene
+        return render_scene
 
-            # Composite onto canvas
-            canvas = self._composite_image(
-                canvas, animated_image,
-                scene_char.position_x, scene_char.position_y,
-                scene_char.scale, scene_char.rotation
+    def _scratch_canvas(self, transparent: bool) -> np.ndarray:
+        """Frame buffer shared by every frame rendered by this renderer."""
+        channels = 4 if transparent else 3
+        if channels not in self._scratch_canvases:
+            self._scratch_canvases[channels] = np.empty(
+                (self.height, self.width, channels), dtype=np.uint8
             )
+        return self._scratch_canvases[channels]
 
-        # Draw text overlays
-        for overlay in scene.text_overlays.all():
-            if overlay.start_time <= time < overlay.start_time + overlay.duration:
-                overlay_time = time - overlay.start_time
-                canvas = self._render_text_overlay(canvas, overlay, overlay_time)
+    def _static_canvas(self, scene, transparent: bool, static_chars: list) -> np.ndarray:
+        """
+        Background plus the given unanimated characters (as built by
+        _scene_renderer), composited once per scene and set of visible
+        characters. The returned array is shared and read-only, callers
+        draw on a copy.
+        """
+        key = (scene.id, transparent, tuple(character[0].id for character in static_chars))
 
-        # Apply camera
-        if scene.camera_zoom != 1.0 or scene.camera_x != 0 or scene.camera_y != 0:
-            canvas = self._apply_camera(canvas, scene)
+        if key not in self._static_canvases:
+            # Create canvas
+            if transparent:
+                canvas = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+            else:
+                # Parse background color
+                bg_color = self._hex_to_bgr(scene.background_color)
+                canvas = np.full((self.height, self.width, 3), bg_color, dtype=np.uint8)
+
+            # Draw background image if present
+            if scene.background:
+                bg_image = self._load_image(scene.background.image.path)
+                if bg_image is not None:
+                    canvas = self._composite_image(canvas, bg_image, 0, 0, 1.0, 0)
+
+            for scene_char, _, _, _, image_path in static_chars:
+                canvas = self._draw_character(canvas, scene_char, image_path, 0)
+
+            canvas.flags.writeable = False
+            self._static_canvases[key] = canvas
+
+        return self._static_canvases[key]
+
+    def _character_image_path(self, char) -> str:
+        """Path of the image a character is drawn with."""
+        if char.processed_image:
+            return char.processed_image.path
+        return char.original_image.path
+
+    def _draw_character(self, canvas: np.ndarray, scene_char, image_path: str,
+                        time: float) -> np.ndarray:
+        """Composite a scene character, animated at the given time, onto canvas."""
+        # Get character image
+        char = scene_char.character
+        char_image = self._load_image(image_path)
+
+        if char_image is None:
+            return canvas
 
-        return canvas
+        # Apply animations
+        animated_image = self._apply_animations(
+            char_image, scene_char, char.rig_data, time
+        )
+
+        # Apply flip if needed
+        if scene_char.flip_horizontal:
+            animated_image = cv2.flip(animated_image, 1)
+
+        # Composite onto canvas
+        return self._composite_image(
+            canvas, animated_image,
+            scene_char.position_x, scene_char.position_y,
+            scene_char.scale, scene_char.rotation
+        )
 
     def _apply_animations(self, image: np.ndarray, scene_char,
                          rig_data: dict, time: float) -> np.ndarray:
@@ -248,51 +690,51 @@ class AnimationRenderer:
         elif animation.keyframes:
             motion_data = {'keyframes': animation.keyframes, 'duration': animation.duration}
 
-        if not motion_data or 'keyframes' not in motion_data:
+        if not motion_data or not motion_data.get('keyframes'):
             return image
 
-        # Interpolate between keyframes
-        keyframes = motion_data['keyframes']
-        duration = motion_data.get('duration', animation.duration)
+        times, joint_names, rotations = self._keyframe_arrays(animation.id, motion_data['keyframes'])
 
-        # Find surrounding keyframes
-        prev_kf = keyframes[0]
-        next_kf = keyframes[-1]
-
-        for i, kf in enumerate(keyframes):
-            if kf['time'] <= local_time:
-                prev_kf = kf
-                if i + 1 < len(keyframes):
-                    next_kf = keyframes[i + 1]
-                else:
-                    next_kf = kf
-            else:
-                next_kf = kf
-                break
+        # Surrounding keyframes: last one at or before local_time and the one after it
+        prev_idx = max(int(np.searchsorted(times, local_time, side='right')) - 1, 0)
+        next_idx = min(prev_idx + 1, len(times) - 1) if times[0] <= local_time else 0
 
         # Calculate interpolation factor
-        time_range = next_kf['time'] - prev_kf['time']
+        time_range = times[next_idx] - times[prev_idx]
         if time_range > 0:
-            t = (local_time - prev_kf['time']) / time_range
+            t = (local_time - times[prev_idx]) / time_range
             t = self._ease(t, animation.easing)
         else:
             t = 0
 
-        # Interpolate joint values
-        interpolated_joints = {}
-        for joint_name in set(list(prev_kf.get('joints', {}).keys()) +
-                             list(next_kf.get('joints', {}).keys())):
-            prev_joint = prev_kf.get('joints', {}).get(joint_name, {'rotation': 0})
-            next_joint = next_kf.get('joints', {}).get(joint_name, {'rotation': 0})
-
-            interpolated_joints[joint_name] = {
-                'rotation': prev_joint.get('rotation', 0) * (1 - t) +
-                           next_joint.get('rotation', 0) * t
-            }
+        # Interpolate all joint values at once
+        joint_rotations = rotations[prev_idx] * (1 - t) + rotations[next_idx] * t
+        interpolated_joints = {
+            joint_name: {'rotation': rotation}
+            for joint_name, rotation in zip(joint_names, joint_rotations.tolist())
+        }
 
         # Apply deformation based on interpolated joints
         return self._deform_image(image, rig_data, interpolated_joints)
 
+    def _keyframe_arrays(self, animation_id, keyframes: list) -> tuple:
+        """
+        Keyframes as (times[K], joint_names[J], rotations[K, J]) arrays, built
+        once per animation. Joints missing from a keyframe have rotation 0.
+        """
+        if animation_id not in self._keyframe_cache:
+            joint_names = sorted({
+                joint_name for kf in keyframes for joint_name in kf.get('joints', {})
+            })
+            times = np.array([kf['time'] for kf in keyframes], dtype=np.float64)
+            rotations = np.array([
+                [kf.get('joints', {}).get(joint_name, {}).get('rotation', 0) for joint_name in joint_names]
+                for kf in keyframes
+            ], dtype=np.float64).reshape(len(keyframes), len(joint_names))
+            self._keyframe_cache[animation_id] = (times, joint_names, rotations)
+
+        return self._keyframe_cache[animation_id]
+
     def _deform_image(self, image: np.ndarray, rig_data: dict,
                      joints: dict) -> np.ndarray:
         """
@@ -342,15 +784,8 @@ class AnimationRenderer:
         return t
 
     def _load_image(self, path: str) -> Optional[np.ndarray]:
-        """Load image from path with caching."""
-        if path in self.image_cache:
-            return self.image_cache[path].copy()
-
-        image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
-        if image is not None:
-            self.image_cache[path] = image.copy()
-
-        return image
+        """Load image from path with caching. The returned array is shared and read-only."""
+        return _load_cached_image(path)
 
     def _composite_image(self, canvas: np.ndarray, image: np.ndarray,
                         x: float, y: float, scale: float, rotation: float) -> np.ndarray:
@@ -360,28 +795,32 @@ class AnimationRenderer:
 
         h, w = image.shape[:2]
 
-        # Apply scale
-        if scale != 1.0:
-            new_w = int(w * scale)
-            new_h = int(h * scale)
-            image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
-            h, w = new_h, new_w
+        # Right angles rotate exactly without resampling, leaving at most a resize
+        if rotation % 90 == 0:
+            quarter_turns = int(rotation // 90) % 4
+            if quarter_turns:
+                image = cv2.rotate(image, QUARTER_TURNS[quarter_turns])
+                h, w = image.shape[:2]
 
-        # Apply rotation
-        if rotation != 0:
-            center = (w // 2, h // 2)
-            matrix = cv2.getRotationMatrix2D(center, rotation, 1.0)
+            if scale != 1.0:
+                w, h = max(int(w * scale), 1), max(int(h * scale), 1)
+                image = cv2.resize(image, (w, h), interpolation=cv2.INTER_LINEAR)
 
-            # Calculate new bounds
+        # Otherwise scale and rotate in a single resampling pass
+        else:
+            matrix = cv2.getRotationMatrix2D((w / 2, h / 2), rotation, scale)
+
+            # Bounds of the scaled, rotated image
             cos = abs(matrix[0, 0])
             sin = abs(matrix[0, 1])
-            new_w = int(h * sin + w * cos)
-            new_h = int(h * cos + w * sin)
+            new_w = max(int(h * sin + w * cos), 1)
+            new_h = max(int(h * cos + w * sin), 1)
 
             matrix[0, 2] += (new_w - w) / 2
             matrix[1, 2] += (new_h - h) / 2
 
             image = cv2.warpAffine(image, matrix, (new_w, new_h),
+                                   flags=cv2.INTER_LINEAR,
                                    borderMode=cv2.BORDER_CONSTANT,
                                    borderValue=(0, 0, 0, 0) if image.shape[2] == 4 else (255, 255, 255))
             h, w = new_h, new_w
@@ -415,22 +854,39 @@ class AnimationRenderer:
         oy2 = oy1 + (y2 - y1)
 
         # Check if overlay has alpha
-        if overlay.shape[2] == 4:
-            alpha = overlay[oy1:oy2, ox1:ox2, 3:4] / 255.0
+        if overlay.shape[2] == 4 and alpha_over_u8 is not None:
+            alpha_over_u8(canvas, overlay, ox1, oy1, x1, y1, x2 - x1, y2 - y1)
+        elif overlay.shape[2] == 4:
+            alpha = overlay[oy1:oy2, ox1:ox2, 3:4]
             overlay_rgb = overlay[oy1:oy2, ox1:ox2, :3]
+            canvas_rgb = canvas[y1:y2, x1:x2, :3]
+
+            # Fully transparent: nothing to draw
+            if not alpha.any():
+                return canvas
+
+            if alpha.min() == 255:
+                # Fully opaque: straight copy
+                canvas_rgb[:] = overlay_rgb
+            elif _has_hard_mask(overlay):
+                # Alpha is only 0 or 255: masked copy of the opaque pixels
+                mask = (alpha[:, :, 0] == 255).view(np.uint8)
+                if canvas.shape[2] == 4:
+                    cv2.copyTo(overlay[oy1:oy2, ox1:ox2], mask, canvas[y1:y2, x1:x2])
+                else:
+                    cv2.copyTo(overlay_rgb, mask, canvas_rgb)
+            else:
+                # Integer blend, (a*o + (255-a)*c + 127) // 255 fits in uint16
+                a = alpha.astype(np.uint16)
+                blended = a * overlay_rgb
+                blended += (255 - a) * canvas_rgb
+                blended += 127
+                blended //= 255
+                canvas_rgb[:] = blended
 
             if canvas.shape[2] == 4:
-                canvas_rgb = canvas[y1:y2, x1:x2, :3]
-                canvas[y1:y2, x1:x2, :3] = (alpha * overlay_rgb +
-                                            (1 - alpha) * canvas_rgb).astype(np.uint8)
-                canvas[y1:y2, x1:x2, 3:4] = np.maximum(
-                    canvas[y1:y2, x1:x2, 3:4],
-                    overlay[oy1:oy2, ox1:ox2, 3:4]
-                )
-            else:
-                canvas_rgb = canvas[y1:y2, x1:x2]
-                canvas[y1:y2, x1:x2] = (alpha * overlay_rgb +
-                                        (1 - alpha) * canvas_rgb).astype(np.uint8)
+                canvas_alpha = canvas[y1:y2, x1:x2, 3:4]
+                np.maximum(canvas_alpha, alpha, out=canvas_alpha)
         else:
             canvas[y1:y2, x1:x2, :3] = overlay[oy1:oy2, ox1:ox2]
 
@@ -438,17 +894,6 @@ class AnimationRenderer:
 
     def _render_text_overlay(self, canvas: np.ndarray, overlay, time: float) -> np.ndarray:
         """Render text overlay onto canvas."""
-        # Use PIL for text rendering (better font support)
-        pil_image = Image.fromarray(cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB))
-        draw = ImageDraw.Draw(pil_image)
-
-        # Load font
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-                                      overlay.font_size)
-        except:
-            font = ImageFont.load_default()
-
         # Calculate position
         text_x = int(overlay.position_x * self.width / 100)
         text_y = int(overlay.position_y * self.height / 100)
@@ -465,122 +910,224 @@ class AnimationRenderer:
             elif time > overlay.duration - fade_duration:
                 alpha = (overlay.duration - time) / fade_duration
 
-        # Draw text
-        if alpha >= 0.1:
-            draw.text((text_x, text_y), overlay.text, font=font, fill=color)
+        if alpha < 0.1:
+            return canvas
+
+        # Text is rasterized once per (text, size, color) and blended as a small tile
+        tile, offset_x, offset_y = _render_text_tile(overlay.text, overlay.font_size, color)
+        if alpha < 1.0:
+            # Scale the tile's alpha in uint16 like the blend, no float temporaries
+            tile = tile.copy()
+            faded = tile[:, :, 3].astype(np.uint16)
+            faded *= int(alpha * 255)
+            faded += 127
+            faded //= 255
+            tile[:, :, 3] = faded
 
-        return cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+        return self._alpha_composite(canvas, tile, text_x + offset_x, text_y + offset_y)
 
     def _apply_camera(self, canvas: np.ndarray, scene) -> np.ndarray:
         """Apply camera transformations."""
         h, w = canvas.shape[:2]
 
-        # Create transformation matrix
+        # Zoom about the camera center, given as the destination to source map
+        # (zooming by 1/zoom about the same point) so warpAffine skips inverting it
         center_x = w / 2 + scene.camera_x
         center_y = h / 2 + scene.camera_y
 
-        matrix = cv2.getRotationMatrix2D((center_x, center_y), 0, scene.camera_zoom)
+        # Saves clamp the zoom, older rows may still hold 0 or less
+        zoom = max(scene.camera_zoom, scene.MIN_CAMERA_ZOOM)
+        matrix = cv2.getRotationMatrix2D((center_x, center_y), 0, 1 / zoom)
 
         return cv2.warpAffine(canvas, matrix, (w, h),
+                             flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP,
                              borderMode=cv2.BORDER_CONSTANT,
                              borderValue=(255, 255, 255))
 
-    def _encode_video(self, frames_dir: str, format: str, quality: str,
-                     include_audio: bool, transparent: bool,
-                     width: int, height: int) -> str:
-        """Encode frames to video using FFmpeg."""
+    def _hw_encoder(self) -> Optional[str]:
+        """
+        Hardware H.264 encoder to use for mp4, or None for libx264.
+        VIDEO_HW_ENCODER may name an encoder, 'auto' (default) to detect one,
+        or be empty to always encode on the CPU.
+        """
+        configured = getattr(settings, 'VIDEO_HW_ENCODER', 'auto')
+        if not configured:
+            return None
+        if configured == 'auto':
+            return _detect_hw_encoder()
+        return configured
+
+    def _get_output_path(self, format: str) -> str:
+        """Generate export file path"""
         output_dir = os.path.join(settings.MEDIA_ROOT, 'exports')
         os.makedirs(output_dir, exist_ok=True)
+        return os.path.join(output_dir, f'export_{uuid.uuid4()}.{format}')
 
-        output_filename = f'export_{uuid.uuid4()}.{format}'
-        output_path = os.path.join(output_dir, output_filename)
-
+    def _video_command(self, input_args: list, format: str, quality: str,
+                       include_audio: bool, transparent: bool, output_path: str,
+                       width: int, height: int) -> list:
+        """
+        Build the FFmpeg command encoding video from input_args.
+        Input frames are at project size, FFmpeg scales them to width x height.
+        """
         quality_settings = self.QUALITY_SETTINGS.get(quality, self.QUALITY_SETTINGS['high'])
+        hw_encoder = self._hw_encoder() if format == 'mp4' else None
 
-        if format == 'gif':
-            # Use palette-based GIF encoding
-            palette_path = os.path.join(frames_dir, 'palette.png')
-
-            # Generate palette
-            subprocess.run([
-                'ffmpeg', '-y',
-                '-framerate', str(self.fps),
-                '-i', os.path.join(frames_dir, 'frame_%06d.png'),
-                '-vf', f'fps={min(self.fps, 15)},scale={width}:-1:flags=lanczos,palettegen',
-                palette_path
-            ], check=True, capture_output=True)
+        filters = []
+        if width != self.width or height != self.height:
+            filters.append(f'scale={width}:{height}:flags=lanczos')
 
-            # Create GIF
-            subprocess.run([
-                'ffmpeg', '-y',
-                '-framerate', str(self.fps),
-                '-i', os.path.join(frames_dir, 'frame_%06d.png'),
-                '-i', palette_path,
-                '-lavfi', f'fps={min(self.fps, 15)},scale={width}:-1:flags=lanczos[x];[x][1:v]paletteuse',
-                output_path
-            ], check=True, capture_output=True)
+        cmd = ['ffmpeg', '-y']
+        if hw_encoder:
+            hw_pre_input, hw_filters, hw_output = _hw_encoder_args(hw_encoder, quality_settings['crf'])
+            cmd.extend(hw_pre_input)
+            filters.extend(hw_filters)
+        cmd.extend(input_args)
 
-        elif format == 'webm':
-            cmd = [
-                'ffmpeg', '-y',
-                '-framerate', str(self.fps),
-                '-i', os.path.join(frames_dir, 'frame_%06d.png'),
+        if format == 'webm':
+            codec_args = [
                 '-c:v', 'libvpx-vp9',
                 '-b:v', quality_settings['bitrate'],
                 '-pix_fmt', 'yuva420p' if transparent else 'yuv420p',
-                output_path
             ]
-            subprocess.run(cmd, check=True, capture_output=True)
 
         elif format == 'mov':
-            cmd = [
-                'ffmpeg', '-y',
-                '-framerate', str(self.fps),
-                '-i', os.path.join(frames_dir, 'frame_%06d.png'),
+            codec_args = [
                 '-c:v', 'prores_ks',
                 '-profile:v', '4444' if transparent else '3',
                 '-pix_fmt', 'yuva444p10le' if transparent else 'yuv422p10le',
-                output_path
             ]
-            subprocess.run(cmd, check=True, capture_output=True)
-
-        elif format == 'png_sequence':
-            # Just copy frames to output
-            import shutil
-            output_path = os.path.join(output_dir, f'sequence_{uuid.uuid4()}')
-            shutil.copytree(frames_dir, output_path)
 
         else:  # mp4
-            cmd = [
+            # Add audio if needed
+            if include_audio:
+                cmd.extend(self._audio_mix_args())
+
+            if hw_encoder:
+                codec_args = hw_output
+            else:
+                codec_args = [
+                    '-c:v', 'libx264',
+                    '-preset', quality_settings['preset'],
+                    '-crf', str(quality_settings['crf']),
+                    '-pix_fmt', 'yuv420p',
+                ]
+
+        if filters:
+            cmd.extend(['-vf', ','.join(filters)])
+        cmd.extend(codec_args)
+        cmd.append(output_path)
+        return cmd
+
+    def _audio_mix_args(self) -> list:
+        """
+        FFmpeg arguments adding every audio track as an input after the video
+        input and mixing them in one filter_complex pass, each track delayed to
+        its start time, trimmed to its duration and scaled by its volume.
+        """
+        tracks = [track for track in self.project.audio_tracks.all() if track.audio_file]
+        if not tracks:
+            return []
+
+        args = []
+        chains = []
+        for i, track in enumerate(tracks):
+            args.extend(['-i', track.audio_file.path])
+
+            filters = []
+            if track.duration:
+                filters.append(f'atrim=duration={track.duration}')
+            if track.start_time > 0:
+                filters.append(f'adelay=delays={int(track.start_time * 1000)}:all=1')
+            if track.volume != 1.0:
+                filters.append(f'volume={track.volume}')
+            chains.append(f"[{i + 1}:a]{','.join(filters) or 'anull'}[a{i}]")
+
+        inputs = ''.join(f'[a{i}]' for i in range(len(tracks)))
+        graph = ';'.join(chains) + f';{inputs}amix=inputs={len(tracks)}:duration=longest:normalize=0[aout]'
+
+        args.extend([
+            '-filter_complex', graph,
+            '-map', '0:v', '-map', '[aout]',
+            '-c:a', 'aac', '-b:a', '192k',
+        ])
+        return args
+
+    def _encode_video(self, frames_dir: str, format: str, quality: str,
+                     include_audio: bool, transparent: bool,
+                     width: int, height: int) -> str:
+        """Encode saved frames to GIF or a PNG sequence."""
+        output_path = self._get_output_path(format)
+
+        if format == 'gif':
+            # Use palette-based GIF encoding, reusing the palette of an earlier
+            # render with the same images and colors
+            palette_path = self._cached_palette_path(width, height, transparent)
+
+            if os.path.exists(palette_path):
+                # Refresh the mtime so prune_palette_cache keeps palettes in use
+                os.utime(palette_path)
+            else:
+                # Generate palette
+                frames_palette_path = os.path.join(frames_dir, 'palette.png')
+                subprocess.run([
+                    'ffmpeg', '-y',
+                    '-framerate', str(self.fps),
+                    '-i', os.path.join(frames_dir, 'frame_%06d.tiff'),
+                    '-vf', f'fps={min(self.fps, 15)},scale={width}:{height}:flags=lanczos,palettegen',
+                    frames_palette_path
+                ], check=True, capture_output=True)
+
+                os.makedirs(os.path.dirname(palette_path), exist_ok=True)
+                temp_path = f'{palette_path}.{uuid.uuid4()}.tmp'
+                shutil.copyfile(frames_palette_path, temp_path)
+                os.replace(temp_path, palette_path)
+
+            # Create GIF
+            subprocess.run([
                 'ffmpeg', '-y',
                 '-framerate', str(self.fps),
-                '-i', os.path.join(frames_dir, 'frame_%06d.png'),
-                '-c:v', 'libx264',
-                '-preset', 'slow',
-                '-crf', '18',
-                '-pix_fmt', 'yuv420p',
-                '-b:v', quality_settings['bitrate'],
+                '-i', os.path.join(frames_dir, 'frame_%06d.tiff'),
+                '-i', palette_path,
+                '-lavfi', f'fps={min(self.fps, 15)},scale={width}:{height}:flags=lanczos[x];[x][1:v]paletteuse',
                 output_path
-            ]
-
-            # Add audio if needed
-            if include_audio and self.project.audio_tracks.exists():
-                # Mix audio tracks (simplified - would need proper mixing in production)
-                audio_track = self.project.audio_tracks.first()
-                if audio_track and audio_track.audio_file:
-                    cmd.extend(['-i', audio_track.audio_file.path])
-                    cmd.extend(['-c:a', 'aac', '-b:a', '192k'])
+            ], check=True, capture_output=True)
 
-            subprocess.run(cmd, check=True, capture_output=True)
+        elif format == 'png_sequence':
+            # Just copy frames to output
+            output_path = os.path.join(os.path.dirname(output_path), f'sequence_{uuid.uuid4()}')
+            shutil.copytree(frames_dir, output_path)
 
         return output_path
 
+    def _cached_palette_path(self, width: int, height: int, transparent: bool) -> str:
+        """
+        Path of the GIF palette cache entry for this project's current content,
+        keyed by every source image and color that can appear in the frames.
+        """
+        key = [width, height, transparent]
+        for scene in self._scenes():
+            key.append(scene.background_color)
+            if scene.background:
+                key.append(scene.background.image.path)
+            for scene_char in scene.scene_characters.all():
+                char = scene_char.character
+                key.append(self._character_image_path(char))
+            key.extend(overlay.color for overlay in scene.text_overlays.all())
+
+        # Images can be replaced in place, so include their modification times
+        key = [
+            (item, os.path.getmtime(item)) if isinstance(item, str) and os.path.isfile(item) else item
+            for item in key
+        ]
+
+        digest = hashlib.sha1(json.dumps(key).encode()).hexdigest()
+        return os.path.join(_palette_cache_dir(), f'{digest}.png')
+
     def _hex_to_bgr(self, hex_color: str) -> tuple:
         """Convert hex color to BGR tuple."""
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (4, 2, 0))
+        return _parse_hex_color(hex_color)[::-1]
 
     def _hex_to_rgb(self, hex_color: str) -> tuple:
         """Convert hex color to RGB tuple."""
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        return _parse_hex_color(hex_color)
@@ -4,10 +4,33 @@ Uses Coqui TTS or similar for voice generation.
 """
 import os
 import uuid
+import functools
 import tempfile
 from django.conf import settings
 
 
+# Loaded Coqui TTS models keyed by model name
+_tts_cache = {}
+
+
+def _cached_tts(model_name):
+    """
+    Shared Coqui TTS model per model name, None if it cannot be loaded.
+    Failures aren't cached, so a later call retries the load.
+    """
+    if model_name not in _tts_cache:
+        try:
+            from TTS.api import TTS
+            _tts_cache[model_name] = TTS(model_name=model_name)
+        except ImportError:
+            print("Coqui TTS not available, using fallback")
+            return None
+        except Exception as e:
+            print(f"TTS initialization error: {e}")
+            return None
+    return _tts_cache[model_name]
+
+
 class VoiceSynthesizer:
     """
     Text-to-speech synthesis using open source models.
@@ -22,19 +45,9 @@ class VoiceSynthesizer:
     }
 
     def __init__(self):
-        self.tts = None
-        self._init_tts()
-
-    def _init_tts(self):
-        """Initialize TTS engine."""
-        try:
-            from TTS.api import TTS
-            # Use a lightweight model by default
-            self.tts = TTS(model_name="tts_models/en/ljspeech/tacotron2-DDC")
-        except ImportError:
-            print("Coqui TTS not available, using fallback")
-        except Exception as e:
-            print(f"TTS initialization error: {e}")
+        # Use a lightweight model by default
+        self.model_name = self.AVAILABLE_VOICES['default']['model']
+        self.tts = _cached_tts(self.model_name)
 
     def synthesize(self, text: str, voice: str = 'default') -> str:
         """
@@ -59,9 +72,10 @@ class VoiceSynthesizer:
     def _synthesize_with_coqui(self, text: str, voice: str, output_path: str) -> str:
         """Synthesize using Coqui TTS."""
         voice_config = self.AVAILABLE_VOICES.get(voice, self.AVAILABLE_VOICES['default'])
+        tts = _cached_tts(voice_config['model']) or self.tts
 
         # Generate speech
-        self.tts.tts_to_file(
+        tts.tts_to_file(
             text=text,
             file_path=output_path
         )
@@ -141,3 +155,9 @@ class VoiceSynthesizer:
         """Generate a preview of a voice."""
         preview_text = "Hello! This is a preview of my voice."
         return self.synthesize(preview_text, voice)
+
+
+@functools.lru_cache(maxsize=1)
+def get_voice_synthesizer() -> VoiceSynthesizer:
+    """VoiceSynthesizer shared by every job run in this worker process."""
+    return VoiceSynthesizer()
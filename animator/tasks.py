@@ -3,36 +3,91 @@ Background tasks for animation processing using django-rq
 """
 import django_rq
 from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.db import transaction
+from django.db.models import F, Q
 from django.utils import timezone
 import uuid
 import os
 import json
+import time
+import base64
+import hashlib
 
 
-@django_rq.job('default')
+# How long content-addressed model results are kept, see _cached_result
+RESULT_CACHE_TIMEOUT = 30 * 24 * 60 * 60
+
+
+def _file_digest(path):
+    """BLAKE2 hash of a file's contents, read in 1 MiB blocks."""
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cached_result(key, compute):
+    """
+    Model output for key from the cache, running compute() on a miss. Keys are
+    content hashes, so duplicate uploads and template characters skip the model.
+    """
+    return cache.get_or_set(f'animator:{key}', compute, timeout=RESULT_CACHE_TIMEOUT)
+
+
+class _FinishedFile(File):
+    """
+    A generated file that is no longer needed where it is. Storages that
+    support it (FileSystemStorage) move it into place instead of copying.
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def _store_generated_file(field_file, name, path):
+    """
+    Store a generated local file in a FileField without saving the model.
+    The file is renamed into MEDIA_ROOT when possible, streamed otherwise,
+    and the original path is gone afterwards.
+    """
+    with open(path, 'rb') as f:
+        field_file.save(name, _FinishedFile(f), save=False)
+
+    if os.path.exists(path):
+        os.remove(path)
+
+
+@django_rq.job('cpu_heavy')
 def detect_character_rig(character_id):
     """
     Detect character pose and create rig from uploaded image.
     Uses open source pose detection models.
     """
     from .models import Character
-    from .services.pose_detection import PoseDetector
+    from .services.pose_detection import get_pose_detector
 
-    character = Character.objects.get(id=character_id)
+    character = Character.objects.only('id', 'original_image', 'updated_at').get(id=character_id)
 
     try:
-        detector = PoseDetector()
-        rig_data = detector.detect(character.original_image.path)
+        detector = get_pose_detector()
+        image_path = character.original_image.path
+        rig_data = _cached_result(
+            f'pose:{detector.detection_method}:{_file_digest(image_path)}',
+            lambda: detector.detect(image_path),
+        )
 
         character.rig_data = rig_data
-        character.save()
+        character.save(update_fields=['rig_data', 'updated_at'])
 
         return {'status': 'success', 'rig': rig_data}
     except Exception as e:
         return {'status': 'error', 'message': str(e)}
 
 
-@django_rq.job('default')
+@django_rq.job('cpu_heavy')
 def process_character_image(character_id):
     """
     Process uploaded character image:
@@ -41,45 +96,50 @@ def process_character_image(character_id):
     - Create transparency mask
     """
     from .models import Character
-    from .services.image_processing import ImageProcessor
+    from .services.image_processing import get_image_processor
 
-    character = Character.objects.get(id=character_id)
+    # The upload path is built from the project's user, so load both alongside
+    character = Character.objects.select_related('project__user').only(
+        'id', 'original_image', 'processed_image', 'project__id', 'project__user__id'
+    ).get(id=character_id)
 
     try:
-        processor = ImageProcessor()
+        processor = get_image_processor()
         processed_path = processor.remove_background(character.original_image.path)
 
-        # Save processed image
-        from django.core.files import File
-        with open(processed_path, 'rb') as f:
-            character.processed_image.save(
-                f'processed_{character.id}.png',
-                File(f),
-                save=True
-            )
+        # Save processed image, writing just its column
+        _store_generated_file(character.processed_image, f'processed_{character.id}.png', processed_path)
+        Character.objects.filter(pk=character.pk).update(
+            processed_image=character.processed_image.name, updated_at=timezone.now()
+        )
 
         return {'status': 'success'}
     except Exception as e:
         return {'status': 'error', 'message': str(e)}
 
 
-@django_rq.job('default')
+@django_rq.job('cpu_light')
 def generate_motion_from_prompt(character_id, prompt):
     """
     Generate motion/animation from text prompt using motion diffusion models.
     """
     from .models import Character, MotionPreset
-    from .services.motion_generation import MotionGenerator
+    from .services.motion_generation import get_motion_generator
 
-    character = Character.objects.get(id=character_id)
+    character = Character.objects.select_related('project').only(
+        'id', 'character_type', 'rig_data', 'project__user_id'
+    ).get(id=character_id)
 
     try:
-        generator = MotionGenerator()
-        motion_data = generator.generate_from_prompt(
+        generator = get_motion_generator()
+        motion_key = hashlib.blake2b(json.dumps(
+            [prompt, character.character_type, character.rig_data], sort_keys=True
+        ).encode()).hexdigest()
+        motion_data = _cached_result(f'motion:{motion_key}', lambda: generator.generate_from_prompt(
             prompt=prompt,
             character_type=character.character_type,
             rig_data=character.rig_data
-        )
+        ))
 
         # Create a custom motion preset
         preset = MotionPreset.objects.create(
@@ -89,7 +149,7 @@ def generate_motion_from_prompt(character_id, prompt):
             motion_data=motion_data,
             duration_seconds=motion_data.get('duration', 2.0),
             is_system=False,
-            user=character.project.user,
+            user_id=character.project.user_id,
         )
 
         return {'status': 'success', 'preset_id': str(preset.id), 'motion_data': motion_data}
@@ -104,11 +164,12 @@ def render_export(export_id):
     """
     from .models import Export
     from .services.renderer import AnimationRenderer
+    from accounts.models import CustomUser
 
-    export = Export.objects.get(id=export_id)
+    export = Export.objects.select_related('project__user').get(id=export_id)
     export.status = 'processing'
     export.started_at = timezone.now()
-    export.save()
+    Export.objects.filter(pk=export.pk).update(status=export.status, started_at=export.started_at)
 
     try:
         renderer = AnimationRenderer(export.project)
@@ -118,18 +179,36 @@ def render_export(export_id):
         quality_multiplier = {'low': 1, 'medium': 2, 'high': 3, 'ultra': 5}
         credits_needed = int(duration * quality_multiplier.get(export.quality, 1))
 
-        # Check user credits
+        # Reserve credits with one conditional UPDATE so concurrent exports
+        # can't both spend the same balance. The reservation is recorded on
+        # the export with the debit, so it can be given back even if this
+        # worker is killed (see release_export_credits)
         user = export.project.user
-        if user.credits < credits_needed and not user.is_plan_active:
-            export.status = 'failed'
-            export.error_message = 'Insufficient credits'
-            export.save()
-            return {'status': 'error', 'message': 'Insufficient credits'}
+        if not user.is_plan_active:
+            with transaction.atomic():
+                reserved = CustomUser.objects.filter(id=user.id, credits__gte=credits_needed).update(
+                    credits=F('credits') - credits_needed
+                )
+                if reserved:
+                    Export.objects.filter(pk=export.pk).update(credits_reserved=credits_needed)
+            if not reserved:
+                export.status = 'failed'
+                export.error_message = 'Insufficient credits'
+                export.save(update_fields=['status', 'error_message'])
+                return {'status': 'error', 'message': 'Insufficient credits'}
+
+        # Render, writing progress at most every 2% or once a second
+        last_update = [export.progress, time.monotonic()]
 
-        # Render
         def progress_callback(progress):
+            progress = int(progress)
+            now = time.monotonic()
+            if progress - last_update[0] < 2 and now - last_update[1] < 1:
+                return
+
+            last_update[:] = [progress, now]
             export.progress = progress
-            export.save()
+            Export.objects.filter(pk=export.pk).update(progress=progress)
 
         output_path = renderer.render(
             format=export.format,
@@ -140,74 +219,109 @@ def render_export(export_id):
         )
 
         # Save output file
-        from django.core.files import File
-        with open(output_path, 'rb') as f:
-            export.output_file.save(
-                f'{export.project.name}_{export.id}.{export.format}',
-                File(f),
-                save=False
-            )
-
         export.file_size = os.path.getsize(output_path)
+        _store_generated_file(
+            export.output_file, f'{export.project.name}_{export.id}.{export.format}', output_path
+        )
+
         export.status = 'completed'
         export.completed_at = timezone.now()
         export.credits_used = credits_needed
+        export.credits_reserved = 0
         export.progress = 100
-        export.save()
-
-        # Deduct credits
-        if not user.is_plan_active:
-            user.credits -= credits_needed
-            user.save()
-
-        # Cleanup temp file
-        os.remove(output_path)
+        export.save(update_fields=[
+            'output_file', 'file_size', 'status', 'completed_at', 'credits_used',
+            'credits_reserved', 'progress',
+        ])
 
         return {'status': 'success', 'export_id': str(export.id)}
 
     except Exception as e:
         export.status = 'failed'
         export.error_message = str(e)
-        export.save()
+        export.save(update_fields=['status', 'error_message'])
+        release_export_credits(export.id)
         return {'status': 'error', 'message': str(e)}
 
 
-@django_rq.job('default')
-def render_preview_frame(scene_id, frame_number):
+def release_export_credits(export_id):
     """
-    Render a single frame for preview.
+    Give back the credits an export reserved and didn't use. The reservation
+    is cleared with a conditional UPDATE before the refund, so a failed render
+    and a later cleanup sweep refund it once between them.
+    """
+    from .models import Export
+    from accounts.models import CustomUser
+
+    row = Export.objects.filter(pk=export_id).values_list('credits_reserved', 'project__user_id').first()
+    if not row or not row[0]:
+        return 0
+
+    reserved, user_id = row
+    with transaction.atomic():
+        if not Export.objects.filter(pk=export_id, credits_reserved=reserved).update(credits_reserved=0):
+            return 0
+        CustomUser.objects.filter(id=user_id).update(credits=F('credits') + reserved)
+    return reserved
+
+
+def enqueue_render_export(export):
+    """
+    Queue an export render. High and ultra quality go to the 'gpu' queue when
+    RENDER_GPU_QUEUE is set, everything else to render_export's own queue.
+    """
+    if getattr(settings, 'RENDER_GPU_QUEUE', False) and export.quality in ('high', 'ultra'):
+        return django_rq.get_queue('gpu').enqueue(render_export, str(export.id))
+    return render_export.delay(str(export.id))
+
+
+# Rendered preview frames are kept briefly so scrubbing back over them is free
+PREVIEW_CACHE_TIMEOUT = 60
+
+
+def preview_cache_key(scene_id, version, frame_number):
+    return f'animator:preview:{scene_id}:{version}:{frame_number}'
+
+
+@django_rq.job('cpu_light')
+def render_preview_frame(scene_id, frame_number, version=None):
+    """
+    Render a single frame for preview, returned as base64 PNG. It's cached
+    under the scene version the request saw, so a later save misses it.
+    Jobs queued without a version are rendered but not cached.
     """
     from .models import Scene
     from .services.renderer import AnimationRenderer
 
-    scene = Scene.objects.get(id=scene_id)
+    scene = Scene.objects.select_related('project').get(id=scene_id)
 
     try:
         renderer = AnimationRenderer(scene.project)
-        frame_path = renderer.render_frame(scene, frame_number)
+        data = renderer.render_frame_png(scene, frame_number)
+        if version is not None:
+            cache.set(preview_cache_key(scene_id, version, frame_number), data, PREVIEW_CACHE_TIMEOUT)
 
-        return {'status': 'success', 'frame_path': frame_path}
+        return {'status': 'success', 'frame_b64': base64.b64encode(data).decode()}
     except Exception as e:
         return {'status': 'error', 'message': str(e)}
 
 
-@django_rq.job('default')
+@django_rq.job('gpu')
 def generate_background(user_id, prompt):
     """
     Generate background image using AI (Stable Diffusion).
     """
     from .models import Background
-    from .services.image_generation import ImageGenerator
+    from .services.image_generation import get_image_generator
     from accounts.models import CustomUser
 
-    user = CustomUser.objects.get(id=user_id)
+    user = CustomUser.objects.only('id').get(id=user_id)
 
     try:
-        generator = ImageGenerator()
+        generator = get_image_generator()
         image_path = generator.generate_background(prompt)
 
         # Create background record
-        from django.core.files import File
         background = Background(
             user=user,
             name=f"AI: {prompt[:50]}",
@@ -215,37 +329,29 @@ def generate_background(user_id, prompt):
             is_ai_generated=True,
         )
 
-        with open(image_path, 'rb') as f:
-            background.image.save(
-                f'ai_bg_{uuid.uuid4()}.png',
-                File(f),
-                save=True
-            )
-
-        # Cleanup
-        os.remove(image_path)
+        _store_generated_file(background.image, f'ai_bg_{uuid.uuid4()}.png', image_path)
+        background.save()
 
         return {'status': 'success', 'background_id': str(background.id)}
     except Exception as e:
         return {'status': 'error', 'message': str(e)}
 
 
-@django_rq.job('default')
+@django_rq.job('gpu')
 def synthesize_voice(project_id, text, voice):
     """
     Synthesize voice from text using TTS models.
     """
     from .models import Project, AudioTrack
-    from .services.voice_synthesis import VoiceSynthesizer
+    from .services.voice_synthesis import get_voice_synthesizer
 
-    project = Project.objects.get(id=project_id)
+    project = Project.objects.select_related('user').only('id', 'user__id').get(id=project_id)
 
     try:
-        synthesizer = VoiceSynthesizer()
+        synthesizer = get_voice_synthesizer()
         audio_path = synthesizer.synthesize(text, voice)
 
         # Create audio track
-        from django.core.files import File
         audio_track = AudioTrack(
             project=project,
             name=f"Voice: {text[:30]}...",
@@ -254,35 +360,31 @@ def synthesize_voice(project_id, text, voice):
             voice_character=voice,
         )
 
-        with open(audio_path, 'rb') as f:
-            audio_track.audio_file.save(
-                f'voice_{uuid.uuid4()}.wav',
-                File(f),
-                save=True
-            )
-
-        # Cleanup
-        os.remove(audio_path)
+        _store_generated_file(audio_track.audio_file, f'voice_{uuid.uuid4()}.wav', audio_path)
+        audio_track.save()
 
         return {'status': 'success', 'audio_track_id': str(audio_track.id)}
     except Exception as e:
         return {'status': 'error', 'message': str(e)}
 
 
-@django_rq.job('default')
+@django_rq.job('cpu_light')
 def generate_lipsync_data(audio_track_id, scene_character_id):
     """
     Generate lip sync data from audio.
     """
     from .models import AudioTrack, SceneCharacter, LipSyncData
-    from .services.lipsync import LipSyncGenerator
+    from .services.lipsync import get_lipsync_generator
 
-    audio_track = AudioTrack.objects.get(id=audio_track_id)
-    scene_character = SceneCharacter.objects.get(id=scene_character_id)
+    audio_track = AudioTrack.objects.only('id', 'audio_file').get(id=audio_track_id)
+    scene_character = SceneCharacter.objects.only('id').get(id=scene_character_id)
 
     try:
-        generator = LipSyncGenerator()
-        phoneme_data = generator.generate(audio_track.audio_file.path)
+        generator = get_lipsync_generator()
+        audio_path = audio_track.audio_file.path
+        phoneme_data = _cached_result(
+            f'lipsync:{_file_digest(audio_path)}', lambda: generator.generate(audio_path)
+        )
 
         # Create lip sync data
         lipsync = LipSyncData.objects.create(
@@ -297,13 +399,53 @@ def generate_lipsync_data(audio_track_id, scene_character_id):
         return {'status': 'error', 'message': str(e)}
 
 
-@django_rq.job('low')
+@django_rq.job('io')
+def send_collaboration_email(invite_id, lang_iso):
+    """
+    Email a collaboration invite to the invited address.
+    """
+    from .models import CollaborationInvite
+    from app.utils import Utils
+    from translations.models.translation import Translation
+
+    invite = CollaborationInvite.objects.select_related('project', 'invited_by').get(id=invite_id)
+
+    sent = Utils.send_email(
+        recipients=[invite.invited_email],
+        subject=f"You've been invited to collaborate on \"{invite.project.name}\"",
+        template='collaboration-invite',
+        data={
+            'project': invite.project,
+            'invite': invite,
+            'invited_by': invite.invited_by,
+            'i18n': Translation.get_text_by_lang(lang_iso),
+        }
+    )
+    return {'status': 'success' if sent else 'error'}
+
+
+@django_rq.job('io')
 def cleanup_old_exports():
     """
     Cleanup old export files to save storage.
     """
     from .models import Export
+    from .services.renderer import prune_palette_cache
     from datetime import timedelta
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Give back credits still held by failed renders, or by renders whose
+    # worker died (job timeout, OOM, restart) and left them processing
+    stalled_before = timezone.now() - timedelta(seconds=getattr(settings, 'EXPORT_STALL_TIMEOUT', 60 * 60))
+    held = Export.objects.filter(credits_reserved__gt=0).filter(
+        Q(status='failed') | Q(status='processing', started_at__lt=stalled_before)
+    )
+    released = 0
+    for export_id in list(held.values_list('id', flat=True)):
+        Export.objects.filter(pk=export_id, status='processing').update(
+            status='failed', error_message='Render stopped before finishing'
+        )
+        released += release_export_credits(export_id)
 
     cutoff = timezone.now() - timedelta(days=7)
 
@@ -312,9 +454,20 @@ def cleanup_old_exports():
         status='completed'
     )
 
-    for export in old_exports:
-        if export.output_file:
-            export.output_file.delete()
-        export.delete()
+    # Delete in batches of 500 rows so memory stays bounded, removing each
+    # batch's files in parallel
+    storage = Export._meta.get_field('output_file').storage
+    deleted = 0
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        while True:
+            batch = list(old_exports.values_list('id', 'output_file')[:500])
+            if not batch:
+                break
+
+            count, _ = Export.objects.filter(id__in=[export_id for export_id, _ in batch]).delete()
+            deleted += count
+            list(executor.map(storage.delete, [name for _, name in batch if name]))
+
+    palettes = prune_palette_cache(getattr(settings, 'PALETTE_CACHE_MAX_AGE', 30 * 24 * 60 * 60))
 
-    return {'status': 'success', 'deleted': old_exports.count()}
+    return {'status': 'success', 'deleted': deleted, 'credits_released': released, 'palettes_deleted': palettes}
@@ -1,13 +1,20 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse, FileResponse, Http404
-from django.views.decorators.http import require_http_methods
-from django.core.paginator import Paginator
-from django.db.models import Q
+from django.http import JsonResponse, FileResponse, HttpResponse, Http404
+from django.views.decorators.http import require_http_methods, condition
+from django.views.decorators.cache import cache_control
+from django.db.models import Q, F, Func, Prefetch, Exists, OuterRef, Subquery, Count, Max, IntegerField
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.http import content_disposition_header
 from django.conf import settings
+from django.core.cache import cache
 import json
+import base64
+import hashlib
 import os
+from collections import defaultdict
+from urllib.parse import quote
 
 from .models import (
     Project, Character, Background, MotionPreset, Scene, SceneCharacter,
@@ -15,16 +22,57 @@ from .models import (
     Storyboard, StoryboardPanel, LipSyncData, CollaborationInvite, ProjectCollaborator
 )
 from accounts.views import GlobalVars
+from app.utils import CountlessPage
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_response(data):
+    """JsonResponse for the large editor payloads, encoded with orjson when installed"""
+    if orjson is None:
+        return JsonResponse(data)
+    return HttpResponse(orjson.dumps(data), content_type='application/json')
+
+
+def _count_for_project(model):
+    """Subquery counting a project's rows of model, for annotate()"""
+    counts = model.objects.filter(project=OuterRef('pk')).order_by().values('project').annotate(
+        n=Count('pk')
+    ).values('n')
+    return Coalesce(Subquery(counts), 0)
+
+
+def _int(post, key, default):
+    """Integer form value, coerced only when it was submitted"""
+    return int(post[key]) if key in post else default
+
+
+def _accessible_projects(user):
+    """Projects the user owns or collaborates on"""
+    is_collaborator = Exists(ProjectCollaborator.objects.filter(project=OuterRef('pk'), user=user))
+    return Project.objects.filter(Q(user=user) | is_collaborator)
 
 
 def get_project_or_404(user, project_id):
-    """Get project if user owns it or is a collaborator"""
-    project = get_object_or_404(Project, id=project_id)
-    if project.user == user:
-        return project
-    if ProjectCollaborator.objects.filter(project=project, user=user).exists():
-        return project
-    raise Http404("Project not found")
+    """Get project if user owns it or is a collaborator, in one query"""
+    project = _accessible_projects(user).filter(id=project_id).first()
+    if project is None:
+        raise Http404("Project not found")
+    return project
+
+
+def get_owned_project_or_404(user, project_id):
+    """
+    Get project for an owner-only action. Owners are matched on the primary
+    key alone; collaborators get None and anyone else a 404.
+    """
+    project = Project.objects.filter(id=project_id, user=user).first()
+    if project is None:
+        get_project_or_404(user, project_id)
+    return project
 
 
 # Dashboard
@@ -33,21 +81,17 @@ def dashboard(request):
     """Main animator dashboard"""
     g = GlobalVars.get_globals(request)
 
-    # Get user's recent projects
-    projects = Project.objects.filter(
-        Q(user=request.user) | Q(collaborators__user=request.user)
-    ).distinct().order_by('-updated_at')[:6]
+    # Get user's recent projects; EXISTS avoids a join that needs DISTINCT
+    projects = _accessible_projects(request.user).order_by('-updated_at')[:6]
 
-    # Get recent exports
+    # Get recent exports, with the project names the list shows
     exports = Export.objects.filter(
         project__user=request.user,
         status='completed'
-    ).order_by('-completed_at')[:5]
+    ).select_related('project').order_by('-completed_at')[:5]
 
     # Get motion presets for quick access
-    presets = MotionPreset.objects.filter(
-        Q(is_system=True) | Q(user=request.user)
-    ).order_by('category', 'name')[:12]
+    presets = MotionPreset.available_to(request.user)[:12]
 
     context = {
         'g': g,
@@ -66,7 +110,9 @@ def project_list(request):
 
     projects = Project.objects.filter(
         Q(user=request.user) | Q(collaborators__user=request.user)
-    ).distinct().order_by('-updated_at')
+    ).distinct().order_by('-updated_at').annotate(
+        scene_count=_count_for_project(Scene), character_count=_count_for_project(Character),
+    )
 
     # Filter by type
     project_type = request.GET.get('type')
@@ -78,9 +124,7 @@ def project_list(request):
     if status:
         projects = projects.filter(status=status)
 
-    paginator = Paginator(projects, 12)
-    page = request.GET.get('page', 1)
-    projects = paginator.get_page(page)
+    projects = CountlessPage.from_queryset(projects, request.GET.get('page', 1), 12)
 
     context = {
         'g': g,
@@ -94,17 +138,16 @@ def project_list(request):
 @login_required
 def project_create(request):
     """Create a new project"""
-    g = GlobalVars.get_globals(request)
-
     if request.method == 'POST':
+        post = request.POST
         project = Project.objects.create(
             user=request.user,
-            name=request.POST.get('name', 'Untitled Project'),
-            description=request.POST.get('description', ''),
-            project_type=request.POST.get('project_type', 'quick'),
-            width=int(request.POST.get('width', 1920)),
-            height=int(request.POST.get('height', 1080)),
-            fps=int(request.POST.get('fps', 30)),
+            name=post.get('name', 'Untitled Project'),
+            description=post.get('description', ''),
+            project_type=post.get('project_type', 'quick'),
+            width=_int(post, 'width', 1920),
+            height=_int(post, 'height', 1080),
+            fps=_int(post, 'fps', 30),
         )
 
         # Create initial scene
@@ -117,7 +160,7 @@ def project_create(request):
         return redirect('animator:project_detail', project_id=project.id)
 
     context = {
-        'g': g,
+        'g': GlobalVars.get_globals(request),
         'project_types': Project.PROJECT_TYPE_CHOICES,
     }
     return render(request, 'animator/project_create.html', context)
@@ -133,7 +176,7 @@ def project_detail(request, project_id):
         'g': g,
         'project': project,
         'characters': project.characters.all(),
-        'scenes': project.scenes.all(),
+        'scenes': project.scenes.annotate(character_count=Count('scene_characters')),
         'exports': project.exports.order_by('-created_at')[:5],
     }
     return render(request, 'animator/project_detail.html', context)
@@ -142,20 +185,21 @@ def project_detail(request, project_id):
 @login_required
 def project_edit(request, project_id):
     """Edit project settings"""
-    g = GlobalVars.get_globals(request)
     project = get_project_or_404(request.user, project_id)
 
     if request.method == 'POST':
-        project.name = request.POST.get('name', project.name)
-        project.description = request.POST.get('description', '')
-        project.width = int(request.POST.get('width', project.width))
-        project.height = int(request.POST.get('height', project.height))
-        project.fps = int(request.POST.get('fps', project.fps))
-        project.save()
+        post = request.POST
+        project.name = post.get('name', project.name)
+        project.description = post.get('description', '')
+        project.width = _int(post, 'width', project.width)
+        project.height = _int(post, 'height', project.height)
+        project.fps = _int(post, 'fps', project.fps)
+        # Only the edited columns, so a concurrent status change by a worker isn't overwritten
+        project.save(update_fields=['name', 'description', 'width', 'height', 'fps', 'updated_at'])
         return redirect('animator:project_detail', project_id=project.id)
 
     context = {
-        'g': g,
+        'g': GlobalVars.get_globals(request),
         'project': project,
     }
     return render(request, 'animator/project_edit.html', context)
@@ -164,14 +208,13 @@ def project_edit(request, project_id):
 @login_required
 def project_delete(request, project_id):
     """Delete a project"""
-    project = get_project_or_404(request.user, project_id)
+    project = get_owned_project_or_404(request.user, project_id)
 
-    if request.method == 'POST':
-        if project.user == request.user:  # Only owner can delete
-            project.delete()
-            return redirect('animator:project_list')
+    if request.method == 'POST' and project:  # Only owner can delete
+        project.delete()
+        return redirect('animator:project_list')
 
-    return redirect('animator:project_detail', project_id=project.id)
+    return redirect('animator:project_detail', project_id=project_id)
 
 
 # Quick Animation (simplified single-page workflow)
@@ -180,9 +223,7 @@ def quick_animate(request):
     """Quick animation - upload and animate in one page"""
     g = GlobalVars.get_globals(request)
 
-    presets = MotionPreset.objects.filter(
-        Q(is_system=True) | Q(user=request.user)
-    ).order_by('category', 'name')
+    presets = MotionPreset.available_to(request.user)
 
     context = {
         'g': g,
@@ -251,12 +292,12 @@ def character_detail(request, character_id):
     """View character details"""
     g = GlobalVars.get_globals(request)
     character = get_object_or_404(Character, id=character_id)
-    get_project_or_404(request.user, character.project.id)
+    project = get_project_or_404(request.user, character.project_id)
 
     context = {
         'g': g,
         'character': character,
-        'project': character.project,
+        'project': project,
     }
     return render(request, 'animator/character_detail.html', context)
 
@@ -266,12 +307,12 @@ def character_rig_editor(request, character_id):
     """Interactive rig editor for character"""
     g = GlobalVars.get_globals(request)
     character = get_object_or_404(Character, id=character_id)
-    get_project_or_404(request.user, character.project.id)
+    project = get_project_or_404(request.user, character.project_id)
 
     context = {
         'g': g,
         'character': character,
-        'project': character.project,
+        'project': project,
     }
     return render(request, 'animator/character_rig_editor.html', context)
 
@@ -280,7 +321,7 @@ def character_rig_editor(request, character_id):
 def character_delete(request, character_id):
     """Delete a character"""
     character = get_object_or_404(Character, id=character_id)
-    project = get_project_or_404(request.user, character.project.id)
+    project = get_project_or_404(request.user, character.project_id)
 
     if request.method == 'POST':
         character.delete()
@@ -311,8 +352,8 @@ def scene_create(request, project_id):
 
     if request.method == 'POST':
         # Get the next order number
-        max_order = project.scenes.order_by('-order').first()
-        next_order = (max_order.order + 1) if max_order else 0
+        max_order = project.scenes.aggregate(max_order=Max('order'))['max_order']
+        next_order = (max_order + 1) if max_order is not None else 0
 
         scene = Scene.objects.create(
             project=project,
@@ -330,11 +371,9 @@ def scene_editor(request, scene_id):
     """Scene composition editor"""
     g = GlobalVars.get_globals(request)
     scene = get_object_or_404(Scene, id=scene_id)
-    project = get_project_or_404(request.user, scene.project.id)
+    project = get_project_or_404(request.user, scene.project_id)
 
-    presets = MotionPreset.objects.filter(
-        Q(is_system=True) | Q(user=request.user)
-    ).order_by('category', 'name')
+    presets = MotionPreset.available_to(request.user)
 
     backgrounds = Background.objects.filter(user=request.user)
 
@@ -343,7 +382,7 @@ def scene_editor(request, scene_id):
         'scene': scene,
         'project': project,
         'characters': project.characters.filter(is_rig_confirmed=True),
-        'scene_characters': scene.scene_characters.all(),
+        'scene_characters': scene.scene_characters.select_related('character'),
         'presets': presets,
         'backgrounds': backgrounds,
     }
@@ -354,7 +393,7 @@ def scene_editor(request, scene_id):
 def scene_delete(request, scene_id):
     """Delete a scene"""
     scene = get_object_or_404(Scene, id=scene_id)
-    project = get_project_or_404(request.user, scene.project.id)
+    project = get_project_or_404(request.user, scene.project_id)
 
     if request.method == 'POST':
         scene.delete()
@@ -373,7 +412,7 @@ def timeline_editor(request, project_id):
     context = {
         'g': g,
         'project': project,
-        'scenes': project.scenes.all(),
+        'scenes': project.scenes.annotate(character_count=Count('scene_characters')),
         'audio_tracks': project.audio_tracks.all(),
     }
     return render(request, 'animator/timeline_editor.html', context)
@@ -392,7 +431,8 @@ def storyboard_editor(request, project_id):
         'g': g,
         'project': project,
         'storyboard': storyboard,
-        'panels': storyboard.panels.all(),
+        # The page doesn't render the in-browser sketch JSON, the bulk of each panel
+        'panels': storyboard.panels.defer('sketch_data'),
     }
     return render(request, 'animator/storyboard_editor.html', context)
 
@@ -414,8 +454,8 @@ def export_project(request, project_id):
         )
 
         # Queue export job
-        from .tasks import render_export
-        render_export.delay(str(export.id))
+        from .tasks import enqueue_render_export
+        enqueue_render_export(export)
 
         return redirect('animator:export_status', export_id=export.id)
 
@@ -444,16 +484,32 @@ def export_status(request, export_id):
 @login_required
 def export_download(request, export_id):
     """Download exported file"""
-    export = get_object_or_404(Export, id=export_id, project__user=request.user)
+    export = get_object_or_404(
+        Export.objects.select_related('project'), id=export_id, project__user=request.user
+    )
 
     if export.status != 'completed' or not export.output_file:
         raise Http404("Export not ready")
 
-    return FileResponse(
-        export.output_file.open('rb'),
-        as_attachment=True,
-        filename=f"{export.project.name}.{export.format}"
-    )
+    filename = f"{export.project.name}.{export.format}"
+
+    # Let nginx send the file from its internal location, see nginx.conf.j2
+    accel_prefix = getattr(settings, 'EXPORT_X_ACCEL_REDIRECT', None)
+    if accel_prefix:
+        response = HttpResponse()
+        del response['Content-Type']
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        response['X-Accel-Redirect'] = accel_prefix + quote(export.output_file.name)
+        return response
+
+    # Remote storages serve the file themselves (S3 backends return a signed URL)
+    try:
+        path = export.output_file.path
+    except NotImplementedError:
+        return redirect(export.output_file.url)
+
+    # A real file object lets the WSGI server use sendfile
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=filename)
 
 
 # Motion Presets
@@ -462,16 +518,11 @@ def motion_preset_list(request):
     g = GlobalVars.get_globals(request)
 
     # Show system presets to everyone, user presets only to logged-in users
-    if request.user.is_authenticated:
-        presets = MotionPreset.objects.filter(
-            Q(is_system=True) | Q(user=request.user)
-        ).order_by('category', 'name')
-    else:
-        presets = MotionPreset.objects.filter(is_system=True).order_by('category', 'name')
+    presets = MotionPreset.available_to(request.user)
 
     category = request.GET.get('category')
     if category:
-        presets = presets.filter(category=category)
+        presets = [preset for preset in presets if preset.category == category]
 
     context = {
         'g': g,
@@ -594,9 +645,9 @@ def collaborator_list(request, project_id):
 @login_required
 def collaborator_invite(request, project_id):
     """Invite a collaborator"""
-    project = get_project_or_404(request.user, project_id)
+    project = get_owned_project_or_404(request.user, project_id)
 
-    if request.method == 'POST' and project.user == request.user:
+    if request.method == 'POST' and project:
         email = request.POST.get('email')
         permission = request.POST.get('permission', 'edit')
 
@@ -607,30 +658,80 @@ def collaborator_invite(request, project_id):
                 invited_email=email,
                 permission=permission,
             )
-            # Send email invitation
-            from app.utils import Utils
-            from accounts.views import GlobalVars
+            # Send email invitation from a worker so SMTP latency stays off the request
+            from .tasks import send_collaboration_email
             g = GlobalVars.get_globals(request)
-            Utils.send_email(
-                recipients=[email],
-                subject=f"You've been invited to collaborate on \"{project.name}\"",
-                template='collaboration-invite',
-                data={
-                    'project': project,
-                    'invite': invite,
-                    'invited_by': request.user,
-                    'i18n': g.get('i18n'),
-                }
-            )
+            send_collaboration_email.delay(str(invite.id), g['lang'].iso)
 
-    return redirect('animator:collaborator_list', project_id=project.id)
+    return redirect('animator:collaborator_list', project_id=project_id)
 
 
 # API Endpoints
+def _latest_and_count(rows):
+    """
+    Subqueries for the newest updated_at and the number of rows. Any edit
+    moves the first and any delete the second, however the rows were written.
+    """
+    rows = rows.order_by()
+    return (
+        Subquery(rows.annotate(value=Func(F('updated_at'), function='MAX')).values('value')),
+        Subquery(rows.annotate(
+            value=Func(F('pk'), function='COUNT', output_field=IntegerField())
+        ).values('value')),
+    )
+
+
+def _content_stamp(queryset, **children):
+    """
+    Digest of the first row's updated_at together with the newest updated_at
+    and count of each child queryset (filtered on OuterRef('pk')), read in one
+    query. None when queryset is empty.
+    """
+    annotations = {}
+    for name, rows in children.items():
+        annotations[f'{name}_at'], annotations[f'{name}_count'] = _latest_and_count(rows)
+    row = queryset.annotate(**annotations).values_list('updated_at', *annotations).first()
+    if row is None:
+        return None
+    return hashlib.md5(repr(row).encode()).hexdigest()
+
+
+def _project_stamp(user, project_id):
+    """Version of everything api_project_data serves for a project."""
+    return _content_stamp(
+        _accessible_projects(user).filter(id=project_id),
+        characters=Character.objects.filter(project=OuterRef('pk')),
+        scenes=Scene.objects.filter(project=OuterRef('pk')),
+        placements=SceneCharacter.objects.filter(scene__project=OuterRef('pk')),
+        animations=Animation.objects.filter(scene_character__scene__project=OuterRef('pk')),
+    )
+
+
+def _scene_stamp(user, scene_id):
+    """
+    Version of everything drawn in a scene's frames: what api_scene_data
+    serves plus the animations and the project's dimensions.
+    """
+    return _content_stamp(
+        Scene.objects.filter(id=scene_id, project__in=_accessible_projects(user)),
+        project=Project.objects.filter(scenes=OuterRef('pk')),
+        placements=SceneCharacter.objects.filter(scene=OuterRef('pk')),
+        characters=Character.objects.filter(scenecharacter__scene=OuterRef('pk')),
+        animations=Animation.objects.filter(scene_character__scene=OuterRef('pk')),
+        overlays=TextOverlay.objects.filter(scene=OuterRef('pk')),
+    )
+
+
+def _project_data_etag(request, project_id):
+    return _project_stamp(request.user, project_id)
+
+
 @login_required
 @require_http_methods(["GET"])
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_project_data_etag)
 def api_project_data(request, project_id):
-    """Get full project data as JSON"""
+    """Get full project data as JSON, 304 while the project is unchanged"""
     project = get_project_or_404(request.user, project_id)
 
     data = {
@@ -644,7 +745,38 @@ def api_project_data(request, project_id):
         'characters': [],
     }
 
-    for character in project.characters.all():
+    # Animations are the bulk of a large project, so they're read as plain
+    # rows rather than model instances and grouped by scene character
+    animations = defaultdict(list)
+    for anim in Animation.objects.filter(scene_character__scene__project=project).values(
+        'id', 'scene_character_id', 'motion_preset_id', 'keyframes', 'start_time', 'duration',
+        'speed_multiplier', 'loop', 'easing',
+    ):
+        animations[anim['scene_character_id']].append({
+            'id': str(anim['id']),
+            'preset_id': str(anim['motion_preset_id']) if anim['motion_preset_id'] else None,
+            'keyframes': anim['keyframes'],
+            'start_time': anim['start_time'],
+            'duration': anim['duration'],
+            'speed': anim['speed_multiplier'],
+            'loop': anim['loop'],
+            'easing': anim['easing'],
+        })
+
+    # Only the columns serialized below are loaded
+    scene_characters = SceneCharacter.objects.only(
+        'id', 'scene', 'character', 'position_x', 'position_y', 'scale', 'rotation',
+        'z_index', 'flip_horizontal',
+    )
+    scenes = project.scenes.select_related('background').only(
+        'id', 'project', 'name', 'order', 'duration', 'background_color', 'background__image',
+        'camera_zoom', 'camera_x', 'camera_y',
+    ).prefetch_related(Prefetch('scene_characters', queryset=scene_characters))
+    characters = project.characters.only(
+        'id', 'project', 'name', 'character_type', 'processed_image', 'original_image', 'rig_data',
+    )
+
+    for character in characters:
         data['characters'].append({
             'id': str(character.id),
             'name': character.name,
@@ -653,7 +785,7 @@ def api_project_data(request, project_id):
             'rig': character.rig_data,
         })
 
-    for scene in project.scenes.all():
+    for scene in scenes:
         scene_data = {
             'id': str(scene.id),
             'name': scene.name,
@@ -672,32 +804,20 @@ def api_project_data(request, project_id):
         for sc in scene.scene_characters.all():
             sc_data = {
                 'id': str(sc.id),
-                'character_id': str(sc.character.id),
+                'character_id': str(sc.character_id),
                 'position': {'x': sc.position_x, 'y': sc.position_y},
                 'scale': sc.scale,
                 'rotation': sc.rotation,
                 'z_index': sc.z_index,
                 'flip': sc.flip_horizontal,
-                'animations': [],
+                'animations': animations.get(sc.id, []),
             }
 
-            for anim in sc.animations.all():
-                sc_data['animations'].append({
-                    'id': str(anim.id),
-                    'preset_id': str(anim.motion_preset.id) if anim.motion_preset else None,
-                    'keyframes': anim.keyframes,
-                    'start_time': anim.start_time,
-                    'duration': anim.duration,
-                    'speed': anim.speed_multiplier,
-                    'loop': anim.loop,
-                    'easing': anim.easing,
-                })
-
             scene_data['characters'].append(sc_data)
 
         data['scenes'].append(scene_data)
 
-    return JsonResponse(data)
+    return _json_response(data)
 
 
 @login_required
@@ -705,7 +825,7 @@ def api_project_data(request, project_id):
 def api_detect_character(request, character_id):
     """Auto-detect character pose/rig from image"""
     character = get_object_or_404(Character, id=character_id)
-    get_project_or_404(request.user, character.project.id)
+    get_project_or_404(request.user, character.project_id)
 
     # Queue detection job
     from .tasks import detect_character_rig
@@ -719,7 +839,7 @@ def api_detect_character(request, character_id):
 def api_save_rig(request, character_id):
     """Save character rig data"""
     character = get_object_or_404(Character, id=character_id)
-    get_project_or_404(request.user, character.project.id)
+    get_project_or_404(request.user, character.project_id)
 
     try:
         data = json.loads(request.body)
@@ -731,12 +851,18 @@ def api_save_rig(request, character_id):
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
 
 
+def _scene_data_etag(request, scene_id):
+    return _scene_stamp(request.user, scene_id)
+
+
 @login_required
 @require_http_methods(["GET"])
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_scene_data_etag)
 def api_scene_data(request, scene_id):
-    """Get scene data as JSON"""
+    """Get scene data as JSON, 304 while the scene is unchanged"""
     scene = get_object_or_404(Scene, id=scene_id)
-    get_project_or_404(request.user, scene.project.id)
+    get_project_or_404(request.user, scene.project_id)
 
     data = {
         'id': str(scene.id),
@@ -747,10 +873,10 @@ def api_scene_data(request, scene_id):
         'text_overlays': [],
     }
 
-    for sc in scene.scene_characters.all():
+    for sc in scene.scene_characters.select_related('character'):
         data['characters'].append({
             'id': str(sc.id),
-            'character_id': str(sc.character.id),
+            'character_id': str(sc.character_id),
             'name': sc.character.name,
             'image': sc.character.processed_image.url if sc.character.processed_image else sc.character.original_image.url,
             'position': {'x': sc.position_x, 'y': sc.position_y},
@@ -772,7 +898,7 @@ def api_scene_data(request, scene_id):
             'duration': overlay.duration,
         })
 
-    return JsonResponse(data)
+    return _json_response(data)
 
 
 @login_required
@@ -780,30 +906,47 @@ def api_scene_data(request, scene_id):
 def api_save_scene(request, scene_id):
     """Save scene data"""
     scene = get_object_or_404(Scene, id=scene_id)
-    get_project_or_404(request.user, scene.project.id)
+    get_project_or_404(request.user, scene.project_id)
 
     try:
         data = json.loads(request.body)
 
         scene.duration = data.get('duration', scene.duration)
         scene.background_color = data.get('background_color', scene.background_color)
-        scene.camera_zoom = data.get('camera', {}).get('zoom', scene.camera_zoom)
+        try:
+            # The renderer divides by the zoom
+            zoom = float(data.get('camera', {}).get('zoom', scene.camera_zoom))
+        except (TypeError, ValueError):
+            return JsonResponse({'error': 'Invalid camera zoom'}, status=400)
+        scene.camera_zoom = max(zoom, Scene.MIN_CAMERA_ZOOM)
         scene.camera_x = data.get('camera', {}).get('x', scene.camera_x)
         scene.camera_y = data.get('camera', {}).get('y', scene.camera_y)
         scene.save()
 
-        # Update scene characters
-        for char_data in data.get('characters', []):
-            if 'id' in char_data:
-                sc = SceneCharacter.objects.filter(id=char_data['id']).first()
-                if sc:
-                    sc.position_x = char_data.get('position', {}).get('x', sc.position_x)
-                    sc.position_y = char_data.get('position', {}).get('y', sc.position_y)
-                    sc.scale = char_data.get('scale', sc.scale)
-                    sc.rotation = char_data.get('rotation', sc.rotation)
-                    sc.z_index = char_data.get('z_index', sc.z_index)
-                    sc.flip_horizontal = char_data.get('flip', sc.flip_horizontal)
-                    sc.save()
+        # Update this scene's characters with one SELECT and one bulk UPDATE
+        char_updates = [c for c in data.get('characters', []) if 'id' in c]
+        scene_characters = {
+            str(sc.id): sc for sc in SceneCharacter.objects.filter(
+                scene=scene, id__in=[c['id'] for c in char_updates]
+            )
+        }
+        for char_data in char_updates:
+            sc = scene_characters.get(str(char_data['id']))
+            if sc:
+                sc.position_x = char_data.get('position', {}).get('x', sc.position_x)
+                sc.position_y = char_data.get('position', {}).get('y', sc.position_y)
+                sc.scale = char_data.get('scale', sc.scale)
+                sc.rotation = char_data.get('rotation', sc.rotation)
+                sc.z_index = char_data.get('z_index', sc.z_index)
+                sc.flip_horizontal = char_data.get('flip', sc.flip_horizontal)
+                # bulk_update doesn't apply auto_now
+                sc.updated_at = timezone.now()
+
+        if scene_characters:
+            SceneCharacter.objects.bulk_update(scene_characters.values(), [
+                'position_x', 'position_y', 'scale', 'rotation', 'z_index', 'flip_horizontal',
+                'updated_at',
+            ])
 
         return JsonResponse({'status': 'saved'})
     except json.JSONDecodeError:
@@ -823,7 +966,7 @@ def api_generate_animation(request):
             return JsonResponse({'error': 'Missing prompt or character_id'}, status=400)
 
         character = get_object_or_404(Character, id=character_id)
-        get_project_or_404(request.user, character.project.id)
+        get_project_or_404(request.user, character.project_id)
 
         # Queue animation generation
         from .tasks import generate_motion_from_prompt
@@ -844,22 +987,44 @@ def api_render_preview(request):
         frame = data.get('frame', 0)
 
         scene = get_object_or_404(Scene, id=scene_id)
-        get_project_or_404(request.user, scene.project.id)
+        get_project_or_404(request.user, scene.project_id)
+
+        # Frames rendered in the last minute are returned straight away,
+        # unless anything drawn in the scene has changed since
+        from .tasks import render_preview_frame, preview_cache_key
+        version = _scene_stamp(request.user, scene.id)
+        cached = cache.get(preview_cache_key(scene.id, version, frame))
+        if cached is not None:
+            return JsonResponse({
+                'status': 'success', 'frame_b64': base64.b64encode(cached).decode()
+            })
 
         # Queue preview render
-        from .tasks import render_preview_frame
-        result = render_preview_frame.delay(str(scene.id), frame)
+        result = render_preview_frame.delay(str(scene.id), frame, version)
 
         return JsonResponse({'status': 'processing', 'task_id': str(result.id)})
     except json.JSONDecodeError:
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
 
 
+def _export_status_etag(request, export_id):
+    """Status and progress are all a poll can see change, so they tag the response."""
+    row = Export.objects.filter(
+        id=export_id, project__user=request.user
+    ).values_list('status', 'progress').first()
+    return f'{row[0]}-{row[1]}' if row else None
+
+
 @login_required
 @require_http_methods(["GET"])
+@cache_control(private=True, max_age=1)
+@condition(etag_func=_export_status_etag)
 def api_export_status(request, export_id):
-    """Get export status"""
-    export = get_object_or_404(Export, id=export_id, project__user=request.user)
+    """Get export status, 304 while status and progress are unchanged"""
+    export = get_object_or_404(
+        Export.objects.only('id', 'status', 'progress', 'error_message', 'output_file'),
+        id=export_id, project__user=request.user,
+    )
 
     data = {
         'status': export.status,
@@ -912,7 +1077,7 @@ def api_generate_lipsync(request):
         audio_track = get_object_or_404(AudioTrack, id=audio_track_id)
         scene_character = get_object_or_404(SceneCharacter, id=scene_character_id)
 
-        get_project_or_404(request.user, audio_track.project.id)
+        get_project_or_404(request.user, audio_track.project_id)
 
         # Queue lip sync generation
         from .tasks import generate_lipsync_data
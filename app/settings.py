@@ -180,7 +180,37 @@ RQ_QUEUES = {
         'PORT': 6379,
         'DB': 0,
         'DEFAULT_TIMEOUT': 360,
-    }
+    },
+    # Workload queues, each served by its own worker pool (see supervisor.conf.j2)
+    # so a long diffusion or TTS job can't hold up short interactive ones.
+    # Image generation, TTS, and high/ultra exports when RENDER_GPU_QUEUE is set
+    'gpu': {
+        'HOST': 'localhost',
+        'PORT': 6379,
+        'DB': 0,
+        'DEFAULT_TIMEOUT': 360,
+    },
+    # Background removal and pose detection
+    'cpu_heavy': {
+        'HOST': 'localhost',
+        'PORT': 6379,
+        'DB': 0,
+        'DEFAULT_TIMEOUT': 360,
+    },
+    # Sub-second jobs: preview frames, lip sync, procedural motion
+    'cpu_light': {
+        'HOST': 'localhost',
+        'PORT': 6379,
+        'DB': 0,
+        'DEFAULT_TIMEOUT': 360,
+    },
+    # Storage housekeeping
+    'io': {
+        'HOST': 'localhost',
+        'PORT': 6379,
+        'DB': 0,
+        'DEFAULT_TIMEOUT': 360,
+    },
 }
 AUTH_USER_MODEL = 'accounts.CustomUser'
 AUTHENTICATION_BACKENDS = [
@@ -137,3 +137,48 @@ class Utils:
     @staticmethod
     def set_to_cache(key, value, exp=60 * 60 * 24 * 30):
         cache.set(key, value, timeout=exp)
+
+
+class CountlessPage:
+    """
+    A page of results that never runs COUNT(*): one extra row is fetched to
+    tell whether a next page exists. Covers the parts of Django's Page the
+    templates use, without page_range or num_pages.
+    """
+
+    def __init__(self, object_list, number, has_next):
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+
+    @classmethod
+    def from_queryset(cls, queryset, number, per_page):
+        try:
+            number = max(int(number), 1)
+        except (TypeError, ValueError):
+            number = 1
+
+        offset = (number - 1) * per_page
+        rows = list(queryset[offset:offset + per_page + 1])
+        return cls(rows[:per_page], number, len(rows) > per_page)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self.number > 1
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
@@ -14,3 +14,25 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
 application = get_wsgi_application()
+
+
+def _warm_templates():
+    """
+    Parse the page templates into the cached template loader at worker boot,
+    rather than during each worker's first requests.
+    """
+    from django.conf import settings
+    from django.template.loader import get_template
+
+    for root, dirs, files in os.walk(settings.TEMPLATES_DIR):
+        dirs[:] = [d for d in dirs if d != 'mailing']  # Rendered by the RQ workers
+        for name in files:
+            if name.endswith('.html'):
+                template_name = os.path.relpath(os.path.join(root, name), settings.TEMPLATES_DIR)
+                try:
+                    get_template(template_name)
+                except Exception as e:
+                    print(f"Could not load template {template_name}: {e}")
+
+
+_warm_templates()
@@ -67,6 +67,34 @@ PAYPAL_KEYS = {
 RATE_LIMIT = 10
 FILES_LIMIT = 2147483648  # 2GB
 
+# ONNX pose landmark model, used when MediaPipe is not installed
+# POSE_ONNX_MODEL = '/path/to/pose_landmark_full.onnx'
+# INT8-quantized export of the same model, preferred when no CUDA provider is
+# available; build it with: python manage.py quantize_pose_model
+# POSE_ONNX_MODEL_INT8 = '/path/to/pose_landmark_full.int8.onnx'
+
+# Processes used to render export frames (defaults to CPU count)
+# RENDER_WORKERS = 4
+
+# Hardware H.264 encoder for mp4 exports: 'auto' detects h264_nvenc/h264_qsv/h264_vaapi,
+# an encoder name forces one, '' always uses libx264
+# VIDEO_HW_ENCODER = 'auto'
+
+# Serve export downloads through nginx's internal /protected-uploads/ location
+# (X-Accel-Redirect) instead of streaming them from Django
+# EXPORT_X_ACCEL_REDIRECT = '/protected-uploads/'
+
+# Queue high/ultra quality exports on the 'gpu' RQ queue instead of 'high', for
+# deployments running `manage.py rqworker gpu` on machines with a hardware encoder
+# RENDER_GPU_QUEUE = True
+
+# Seconds after which a processing export is treated as dead and the credits
+# it reserved are given back by cleanup_old_exports (well above the RQ job timeout)
+# EXPORT_STALL_TIMEOUT = 60 * 60
+
+# Seconds a cached GIF palette can go unused before cleanup_old_exports deletes it
+# PALETTE_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
 # Script Version (for cache busting)
 SCRIPT_VERSION = '1.0.0'
 
@@ -1,17 +1,33 @@
-from django.urls import path
+from django.urls import path, include
 from . import views
 
+# Django tries patterns in order, so the busiest pages come first and the
+# SEO landing pages are grouped under their prefix, skipped in one check.
+
+usecase_patterns = [
+    path('content-creators/', views.UseCase_ContentCreators.as_view(), name='usecase-content-creators'),
+    path('educators/', views.UseCase_Educators.as_view(), name='usecase-educators'),
+    path('game-developers/', views.UseCase_GameDev.as_view(), name='usecase-gamedev'),
+    path('artists/', views.UseCase_Artists.as_view(), name='usecase-artists'),
+]
+
+feature_patterns = [
+    path('ai-pose-detection/', views.Feature_PoseDetection.as_view(), name='feature-pose-detection'),
+    path('motion-presets/', views.Feature_MotionPresets.as_view(), name='feature-motion-presets'),
+    path('export-formats/', views.Feature_ExportFormats.as_view(), name='feature-export-formats'),
+]
+
 urlpatterns = [
     path('', views.IndexPage.as_view(), name='index'),
+    path('account/', views.AccountPage.as_view(), name='account'),
+    path('pricing/', views.PricingPage.as_view(), name='pricing'),
     path('login/', views.LoginPage.as_view(), name='login'),
     path('logout/', views.LogoutPage.as_view(), name='logout'),
     path('signup/', views.RegisterPage.as_view(), name='register'),
+    path('checkout/', views.CheckoutPage.as_view(), name='checkout'),
     path('lost-password/', views.LostPasswordPage.as_view(), name='lost-password'),
     path('restore-password/', views.RestorePasswordPage.as_view(), name='restore-password'),
     path('verify/', views.VerifyPage.as_view(), name='verify'),
-    path('account/', views.AccountPage.as_view(), name='account'),
-    path('pricing/', views.PricingPage.as_view(), name='pricing'),
-    path('checkout/', views.CheckoutPage.as_view(), name='checkout'),
     path('contact/', views.ContactPage.as_view(), name='contact'),
     path('about/', views.AboutPage.as_view(), name='about'),
     path('terms/', views.TermsPage.as_view(), name='terms'),
@@ -26,15 +42,10 @@ urlpatterns = [
     path('faq/', views.FAQPage.as_view(), name='faq'),
 
     # Use Case Landing Pages (SEO)
-    path('for/content-creators/', views.UseCase_ContentCreators.as_view(), name='usecase-content-creators'),
-    path('for/educators/', views.UseCase_Educators.as_view(), name='usecase-educators'),
-    path('for/game-developers/', views.UseCase_GameDev.as_view(), name='usecase-gamedev'),
-    path('for/artists/', views.UseCase_Artists.as_view(), name='usecase-artists'),
+    path('for/', include(usecase_patterns)),
 
     # Feature Pages (SEO)
-    path('features/ai-pose-detection/', views.Feature_PoseDetection.as_view(), name='feature-pose-detection'),
-    path('features/motion-presets/', views.Feature_MotionPresets.as_view(), name='feature-motion-presets'),
-    path('features/export-formats/', views.Feature_ExportFormats.as_view(), name='feature-export-formats'),
+    path('features/', include(feature_patterns)),
 
     # API Documentation
     path('api/docs/', views.APIDocsPage.as_view(), name='api-docs'),
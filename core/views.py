@@ -1,14 +1,95 @@
+from functools import wraps
+
+from django.core.cache import cache
+from django.http import HttpResponse
 from django.shortcuts import render, redirect
+from django.template.loader import render_to_string
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
 from django.views.generic import View
 from django.contrib.auth import login, logout
 from django.utils import timezone
 
 from accounts.models import CustomUser
 from accounts.views import GlobalVars
-from app.utils import Utils
+from animator.models import MotionPreset
+from app.utils import Utils, CountlessPage
+from contact_messages.forms import CaptchaForm
 from contact_messages.models.message import Message
+from finances.models.payment import Payment
+from finances.models.plan import Plan
 import config
 
+TITLE_SUFFIX = f" | {config.PROJECT_NAME}"
+
+
+def _title(settings, key, default):
+    """Page title from the i18n text for key, suffixed with the site name"""
+    return settings['i18n'].get(key, default) + TITLE_SUFFIX
+
+
+def confirmed_required(anonymous_url):
+    """
+    Let only logged-in users with a confirmed email through; anyone else is
+    sent to anonymous_url or the verify page.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not request.user.is_authenticated:
+                return redirect(anonymous_url)
+            if not request.user.is_confirm:
+                return redirect('verify')
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class StaticPage(View):
+    """
+    A page that renders its template with just the shared context. Titles and
+    descriptions come from i18n when a key is set, else the fixed text.
+
+    Anonymous visitors get the page's HTML from the cache for cache_timeout
+    seconds, per host, path and language; None renders it every time.
+    """
+    template_name = None
+    page = None
+    title = None
+    title_key = None
+    description = None
+    description_key = None
+    cache_timeout = 60 * 60
+
+    def get_context_data(self, request):
+        settings = GlobalVars.get_globals(request)
+        i18n = settings['i18n']
+        title = i18n.get(self.title_key, self.title) if self.title_key else self.title
+        context = {
+            'title': title + TITLE_SUFFIX,
+            'page': self.page,
+            'g': settings,
+        }
+        if self.description_key:
+            context['description'] = i18n.get(self.description_key, '')
+        elif self.description is not None:
+            context['description'] = self.description
+        return context
+
+    def get(self, request):
+        context = self.get_context_data(request)
+        # Logged-in pages show the account menu, and other query strings
+        # would only fill the cache with copies
+        if not self.cache_timeout or request.user.is_authenticated or set(request.GET) - {'lang'}:
+            return render(request, self.template_name, context)
+
+        key = f"page:{request.scheme}://{request.get_host()}{request.get_full_path()}:{context['g']['lang'].iso}"
+        content = cache.get(key)
+        if content is None:
+            content = render_to_string(self.template_name, context, request)
+            cache.set(key, content, self.cache_timeout)
+        return HttpResponse(content)
+
 
 class IndexPage(View):
     def get(self, request):
@@ -18,7 +99,7 @@ class IndexPage(View):
             'index.html',
             {
                 'title': config.PROJECT_NAME,
-                'description': settings.get('i18n').get('site_description', ''),
+                'description': settings['i18n'].get('site_description', ''),
                 'page': 'home',
                 'g': settings,
             }
@@ -30,14 +111,13 @@ class ContactPage(View):
 
     def get(self, request):
         settings = GlobalVars.get_globals(request)
-        from contact_messages.forms import CaptchaForm
         form = CaptchaForm()
         return render(
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('contact', 'Contact')} | {config.PROJECT_NAME}",
-                'description': settings.get('i18n').get('contact_meta_description', ''),
+                'title': _title(settings, 'contact', 'Contact'),
+                'description': settings['i18n'].get('contact_meta_description', ''),
                 'page': 'contact',
                 'g': settings,
                 'form': form
@@ -46,7 +126,6 @@ class ContactPage(View):
 
     def post(self, request):
         settings = GlobalVars.get_globals(request)
-        from contact_messages.forms import CaptchaForm
         data = request.POST
         form = CaptchaForm(data)
         errors = None
@@ -61,7 +140,7 @@ class ContactPage(View):
                     request,
                     'success.html',
                     {
-                        'title': f"{settings.get('i18n').get('success', 'Success')} | {config.PROJECT_NAME}",
+                        'title': _title(settings, 'success', 'Success'),
                         'page': 'success',
                         'g': settings
                     }
@@ -71,7 +150,7 @@ class ContactPage(View):
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('contact', 'Contact')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'contact', 'Contact'),
                 'page': 'contact',
                 'g': settings,
                 'data': request.POST,
@@ -81,107 +160,54 @@ class ContactPage(View):
         )
 
 
-class AboutPage(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'about.html',
-            {
-                'title': f"{settings.get('i18n').get('about_us', 'About')} | {config.PROJECT_NAME}",
-                'description': settings.get('i18n').get('about_us_meta_description', ''),
-                'page': 'about',
-                'g': settings
-            }
-        )
+class AboutPage(StaticPage):
+    template_name = 'about.html'
+    page = 'about'
+    title_key = 'about_us'
+    title = 'About'
+    description_key = 'about_us_meta_description'
 
 
-class TermsPage(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'terms.html',
-            {
-                'title': f"{settings.get('i18n').get('terms_of_service', 'Terms')} | {config.PROJECT_NAME}",
-                'page': 'terms',
-                'g': settings
-            }
-        )
+class TermsPage(StaticPage):
+    template_name = 'terms.html'
+    page = 'terms'
+    title_key = 'terms_of_service'
+    title = 'Terms'
 
 
-class PrivacyPage(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'privacy.html',
-            {
-                'title': f"{settings.get('i18n').get('privacy_policy', 'Privacy')} | {config.PROJECT_NAME}",
-                'page': 'privacy',
-                'g': settings
-            }
-        )
+class PrivacyPage(StaticPage):
+    template_name = 'privacy.html'
+    page = 'privacy'
+    title_key = 'privacy_policy'
+    title = 'Privacy'
 
 
-class HowItWorksPage(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'how-it-works.html',
-            {
-                'title': f"How It Works | {config.PROJECT_NAME}",
-                'description': 'Learn how to animate your drawings in 4 simple steps: upload, detect, animate, and export.',
-                'page': 'how-it-works',
-                'g': settings
-            }
-        )
+class HowItWorksPage(StaticPage):
+    template_name = 'how-it-works.html'
+    page = 'how-it-works'
+    title = 'How It Works'
+    description = 'Learn how to animate your drawings in 4 simple steps: upload, detect, animate, and export.'
 
 
-class ExamplesPage(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'examples.html',
-            {
-                'title': f"Examples | {config.PROJECT_NAME}",
-                'description': 'See examples of drawings animated with our AI-powered platform.',
-                'page': 'examples',
-                'g': settings
-            }
-        )
+class ExamplesPage(StaticPage):
+    template_name = 'examples.html'
+    page = 'examples'
+    title = 'Examples'
+    description = 'See examples of drawings animated with our AI-powered platform.'
 
 
-class TutorialsPage(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'tutorials.html',
-            {
-                'title': f"Tutorials | {config.PROJECT_NAME}",
-                'description': 'Learn how to get the best results from Animate a Drawing with our tutorials and guides.',
-                'page': 'tutorials',
-                'g': settings
-            }
-        )
+class TutorialsPage(StaticPage):
+    template_name = 'tutorials.html'
+    page = 'tutorials'
+    title = 'Tutorials'
+    description = 'Learn how to get the best results from Animate a Drawing with our tutorials and guides.'
 
 
-class FAQPage(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'faq.html',
-            {
-                'title': f"FAQ | {config.PROJECT_NAME}",
-                'description': 'Frequently asked questions about Animate a Drawing - features, pricing, technical details, and more.',
-                'page': 'faq',
-                'g': settings
-            }
-        )
+class FAQPage(StaticPage):
+    template_name = 'faq.html'
+    page = 'faq'
+    title = 'FAQ'
+    description = 'Frequently asked questions about Animate a Drawing - features, pricing, technical details, and more.'
 
 
 class LoginPage(View):
@@ -195,7 +221,7 @@ class LoginPage(View):
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('login', 'Login')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'login', 'Login'),
                 'page': 'login',
                 'g': settings
             }
@@ -213,7 +239,7 @@ class LoginPage(View):
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('login', 'Login')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'login', 'Login'),
                 'page': 'login',
                 'data': request.POST,
                 'errors': errors,
@@ -239,7 +265,7 @@ class RegisterPage(View):
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('sign_up', 'Sign Up')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'sign_up', 'Sign Up'),
                 'page': 'register',
                 'g': settings
             }
@@ -257,7 +283,7 @@ class RegisterPage(View):
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('sign_up', 'Sign Up')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'sign_up', 'Sign Up'),
                 'page': 'register',
                 'data': request.POST,
                 'errors': errors,
@@ -277,7 +303,7 @@ class LostPasswordPage(View):
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('lost_password', 'Lost Password')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'lost_password', 'Lost Password'),
                 'page': 'lost_password',
                 'g': settings
             }
@@ -293,7 +319,7 @@ class LostPasswordPage(View):
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('lost_password', 'Lost Password')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'lost_password', 'Lost Password'),
                 'page': 'lost_password',
                 'data': {} if account else request.POST,
                 'errors': errors,
@@ -312,16 +338,15 @@ class RestorePasswordPage(View):
         if not token:
             if request.user.is_authenticated:
                 token = Utils.generate_hex_uuid()
-                user = CustomUser.objects.get(email=request.user.email)
-                user.restore_password_token = token
-                user.save()
+                request.user.restore_password_token = token
+                request.user.save(update_fields=['restore_password_token'])
             else:
                 return redirect('index')
         return render(
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('restore_your_password', 'Restore Password')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'restore_your_password', 'Restore Password'),
                 'page': 'reset_password',
                 'g': settings,
                 'token': token
@@ -336,7 +361,7 @@ class RestorePasswordPage(View):
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('restore_your_password', 'Restore Password')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'restore_your_password', 'Restore Password'),
                 'page': 'reset_password',
                 'data': {} if account else request.POST,
                 'token': request.POST.get('token'),
@@ -360,7 +385,7 @@ class VerifyPage(View):
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('verify_email', 'Verify Email')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'verify_email', 'Verify Email'),
                 'page': 'verify',
                 'g': settings
             }
@@ -379,7 +404,7 @@ class VerifyPage(View):
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('verify_email', 'Verify Email')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'verify_email', 'Verify Email'),
                 'page': 'verify',
                 'g': settings,
                 'errors': errors
@@ -387,24 +412,19 @@ class VerifyPage(View):
         )
 
 
+@method_decorator(confirmed_required('login'), name='dispatch')
 class AccountPage(View):
     def get(self, request):
-        if not request.user.is_authenticated:
-            return redirect('login')
-        if not request.user.is_confirm:
-            return redirect('verify')
         settings = GlobalVars.get_globals(request)
-        payments = request.user.get_payments()
-        from finances.models.plan import Plan
-        try:
-            plan_subscribed = Plan.objects.get(code_name=request.user.plan_subscribed)
-        except Plan.DoesNotExist:
-            plan_subscribed = None
+        # Just the columns the history table shows, not the processor payloads
+        payments = request.user.get_payments().only('processor', 'amount', 'status', 'created_at')
+        payments = CountlessPage.from_queryset(payments, request.GET.get('page', 1), 20)
+        plan_subscribed = Plan.by_code_name(request.user.plan_subscribed)
         return render(
             request,
             'account.html',
             {
-                'title': f"{settings.get('i18n').get('account_label', 'Account')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'account_label', 'Account'),
                 'page': 'account',
                 'g': settings,
                 'user': request.user,
@@ -419,42 +439,32 @@ class AccountPage(View):
 class PricingPage(View):
     def get(self, request):
         settings = GlobalVars.get_globals(request)
-        from finances.models.plan import Plan
-        plans = Plan.objects.all().order_by('price')
-        current_plan = None
-        if request.user.is_authenticated and request.user.is_plan_active:
-            current_plan = request.user.plan_subscribed
+        plans = Plan.by_price()
         return render(
             request,
             'pricing.html',
             {
-                'title': f"{settings.get('i18n').get('pricing', 'Pricing')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'pricing', 'Pricing'),
                 'page': 'pricing',
                 'plans': plans,
-                'g': settings,
-                'current_plan': current_plan
+                'g': settings
             }
         )
 
 
+@method_decorator(confirmed_required('register'), name='dispatch')
 class CheckoutPage(View):
     def get(self, request):
-        if not request.user.is_authenticated:
-            return redirect('register')
-        if not request.user.is_confirm:
-            return redirect('verify')
         plan_code = request.GET.get('plan')
-        try:
-            from finances.models.plan import Plan
-            plan = Plan.objects.get(code_name=plan_code)
-        except Plan.DoesNotExist:
+        plan = Plan.by_code_name(plan_code)
+        if plan is None:
             return redirect('pricing')
         settings = GlobalVars.get_globals(request)
         return render(
             request,
             'checkout.html',
             {
-                'title': f"{settings.get('i18n').get('checkout', 'Checkout')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'checkout', 'Checkout'),
                 'page': 'checkout',
                 'g': settings,
                 'user': request.user,
@@ -467,16 +477,10 @@ class CheckoutPage(View):
         )
 
     def post(self, request):
-        if not request.user.is_authenticated:
-            return redirect('register')
-        if not request.user.is_confirm:
-            return redirect('verify')
         data = request.POST
         plan_code = data.get('plan')
-        try:
-            from finances.models.plan import Plan
-            plan = Plan.objects.get(code_name=plan_code)
-        except Plan.DoesNotExist:
+        plan = Plan.by_code_name(plan_code)
+        if plan is None:
             return redirect('pricing')
         settings = GlobalVars.get_globals(request)
         payment, errors = CustomUser.upgrade_account(request.user, data, settings)
@@ -486,7 +490,7 @@ class CheckoutPage(View):
             request,
             'checkout.html',
             {
-                'title': f"{settings.get('i18n').get('checkout', 'Checkout')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'checkout', 'Checkout'),
                 'page': 'checkout',
                 'g': settings,
                 'user': request.user,
@@ -500,39 +504,23 @@ class CheckoutPage(View):
         )
 
 
-class SuccessPage(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'success.html',
-            {
-                'title': f"{settings.get('i18n').get('success', 'Success')} | {config.PROJECT_NAME}",
-                'page': 'success',
-                'g': settings
-            }
-        )
+class SuccessPage(StaticPage):
+    template_name = 'success.html'
+    page = 'success'
+    title_key = 'success'
+    title = 'Success'
 
 
-class RefundPage(View):
+class RefundPage(StaticPage):
     template_name = 'refund.html'
-
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            self.template_name,
-            {
-                'title': f"{settings.get('i18n').get('refund', 'Refund')} | {config.PROJECT_NAME}",
-                'page': 'refund',
-                'g': settings
-            }
-        )
+    page = 'refund'
+    title_key = 'refund'
+    title = 'Refund'
+    cache_timeout = None  # The form carries a CSRF token
 
     def post(self, request):
         settings = GlobalVars.get_globals(request)
         data = request.POST
-        from finances.models.payment import Payment
         refund, errors = Payment.make_refund(
             data.get('transaction_id'),
             data.get('email_refund')
@@ -543,7 +531,7 @@ class RefundPage(View):
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('refund', 'Refund')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'refund', 'Refund'),
                 'page': 'refund',
                 'data': data,
                 'errors': errors,
@@ -561,7 +549,7 @@ class CancelSubscriptionPage(View):
             request,
             'cancel.html',
             {
-                'title': f"{settings.get('i18n').get('cancel', 'Cancel')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'cancel', 'Cancel'),
                 'page': 'cancel',
                 'g': settings
             }
@@ -585,7 +573,7 @@ class DeleteAccountPage(View):
             request,
             self.template_name,
             {
-                'title': f"{settings.get('i18n').get('delete', 'Delete Account')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'delete', 'Delete Account'),
                 'page': 'delete',
                 'g': settings
             }
@@ -606,7 +594,7 @@ class DeleteAccountPage(View):
             request,
             'deleted.html',
             {
-                'title': f"{settings.get('i18n').get('deleted', 'Account Deleted')} | {config.PROJECT_NAME}",
+                'title': _title(settings, 'deleted', 'Account Deleted'),
                 'page': 'deleted',
                 'g': settings,
                 'errors': errors
@@ -618,185 +606,126 @@ class DeleteAccountPage(View):
 # USE CASE LANDING PAGES (SEO)
 # =============================================================================
 
-class UseCase_ContentCreators(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'use-cases/content-creators.html',
-            {
-                'title': f"Animation for Content Creators | {config.PROJECT_NAME}",
-                'description': 'Create eye-catching animated content for YouTube, TikTok, Instagram and more. Turn your drawings into engaging animations.',
-                'page': 'usecase-content-creators',
-                'g': settings
-            }
-        )
+class UseCase_ContentCreators(StaticPage):
+    template_name = 'use-cases/content-creators.html'
+    page = 'usecase-content-creators'
+    title = 'Animation for Content Creators'
+    description = 'Create eye-catching animated content for YouTube, TikTok, Instagram and more. Turn your drawings into engaging animations.'
 
 
-class UseCase_Educators(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'use-cases/educators.html',
-            {
-                'title': f"Animation for Educators & Teachers | {config.PROJECT_NAME}",
-                'description': 'Create engaging educational animations for your classroom. Turn student artwork into animated stories.',
-                'page': 'usecase-educators',
-                'g': settings
-            }
-        )
+class UseCase_Educators(StaticPage):
+    template_name = 'use-cases/educators.html'
+    page = 'usecase-educators'
+    title = 'Animation for Educators & Teachers'
+    description = 'Create engaging educational animations for your classroom. Turn student artwork into animated stories.'
 
 
-class UseCase_GameDev(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'use-cases/game-developers.html',
-            {
-                'title': f"Character Animation for Game Developers | {config.PROJECT_NAME}",
-                'description': 'Create animated game characters from concept art. AI pose detection and motion presets for indie game development.',
-                'page': 'usecase-gamedev',
-                'g': settings
-            }
-        )
+class UseCase_GameDev(StaticPage):
+    template_name = 'use-cases/game-developers.html'
+    page = 'usecase-gamedev'
+    title = 'Character Animation for Game Developers'
+    description = 'Create animated game characters from concept art. AI pose detection and motion presets for indie game development.'
 
 
-class UseCase_Artists(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'use-cases/artists.html',
-            {
-                'title': f"Animation for Artists & Illustrators | {config.PROJECT_NAME}",
-                'description': 'Bring your artwork to life without learning animation. Perfect for illustrators, concept artists, and visual artists.',
-                'page': 'usecase-artists',
-                'g': settings
-            }
-        )
+class UseCase_Artists(StaticPage):
+    template_name = 'use-cases/artists.html'
+    page = 'usecase-artists'
+    title = 'Animation for Artists & Illustrators'
+    description = 'Bring your artwork to life without learning animation. Perfect for illustrators, concept artists, and visual artists.'
 
 
 # =============================================================================
 # FEATURE PAGES (SEO)
 # =============================================================================
 
-class Feature_PoseDetection(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'features/ai-pose-detection.html',
-            {
-                'title': f"AI Pose Detection for Drawings | {config.PROJECT_NAME}",
-                'description': 'Automatic pose detection for your characters using MediaPipe AI. Detect joints and create rigs from any drawing style.',
-                'page': 'feature-pose-detection',
-                'g': settings
-            }
-        )
+class Feature_PoseDetection(StaticPage):
+    template_name = 'features/ai-pose-detection.html'
+    page = 'feature-pose-detection'
+    title = 'AI Pose Detection for Drawings'
+    description = 'Automatic pose detection for your characters using MediaPipe AI. Detect joints and create rigs from any drawing style.'
 
 
-class Feature_MotionPresets(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        from animator.models import MotionPreset
-        presets = MotionPreset.objects.filter(is_system=True).order_by('category', 'name')
-        return render(
-            request,
-            'features/motion-presets.html',
-            {
-                'title': f"Motion Presets Library | {config.PROJECT_NAME}",
-                'description': 'Browse our library of animation presets: walk, run, dance, wave, jump and more. Apply professional animations to your characters.',
-                'page': 'feature-motion-presets',
-                'g': settings,
-                'presets': presets
-            }
-        )
+class Feature_MotionPresets(StaticPage):
+    template_name = 'features/motion-presets.html'
+    page = 'feature-motion-presets'
+    title = 'Motion Presets Library'
+    description = 'Browse our library of animation presets: walk, run, dance, wave, jump and more. Apply professional animations to your characters.'
+    cache_timeout = None  # Shows presets as soon as they're added
 
+    def get_context_data(self, request):
+        context = super().get_context_data(request)
+        context['presets'] = MotionPreset.system_presets()
+        return context
 
-class Feature_ExportFormats(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'features/export-formats.html',
-            {
-                'title': f"Export Formats: MP4, GIF, WebM, PNG | {config.PROJECT_NAME}",
-                'description': 'Export your animations in multiple formats. MP4 for video, GIF for social media, WebM for web, PNG sequence for editing.',
-                'page': 'feature-export-formats',
-                'g': settings
-            }
-        )
+
+class Feature_ExportFormats(StaticPage):
+    template_name = 'features/export-formats.html'
+    page = 'feature-export-formats'
+    title = 'Export Formats: MP4, GIF, WebM, PNG'
+    description = 'Export your animations in multiple formats. MP4 for video, GIF for social media, WebM for web, PNG sequence for editing.'
 
 
 # =============================================================================
 # API DOCUMENTATION
 # =============================================================================
 
-class APIDocsPage(View):
-    def get(self, request):
-        settings = GlobalVars.get_globals(request)
-        return render(
-            request,
-            'api-docs.html',
-            {
-                'title': f"API Documentation | {config.PROJECT_NAME}",
-                'description': 'REST API documentation for Animate a Drawing. Integrate animation into your apps with our simple API.',
-                'page': 'api-docs',
-                'g': settings
-            }
-        )
+class APIDocsPage(StaticPage):
+    template_name = 'api-docs.html'
+    page = 'api-docs'
+    title = 'API Documentation'
+    description = 'REST API documentation for Animate a Drawing. Integrate animation into your apps with our simple API.'
 
 
 # =============================================================================
 # SITEMAP & ROBOTS
 # =============================================================================
 
-from django.http import HttpResponse
-
-class SitemapView(View):
-    def get(self, request):
-        domain = f"https://{config.PROJECT_DOMAIN}"
-        urls = [
-            ('', '1.0', 'weekly'),
-            ('/how-it-works/', '0.9', 'monthly'),
-            ('/examples/', '0.9', 'weekly'),
-            ('/pricing/', '0.9', 'weekly'),
-            ('/tutorials/', '0.8', 'monthly'),
-            ('/faq/', '0.8', 'monthly'),
-            ('/about/', '0.7', 'monthly'),
-            ('/contact/', '0.6', 'monthly'),
-            ('/for/content-creators/', '0.8', 'monthly'),
-            ('/for/educators/', '0.8', 'monthly'),
-            ('/for/game-developers/', '0.8', 'monthly'),
-            ('/for/artists/', '0.8', 'monthly'),
-            ('/features/ai-pose-detection/', '0.7', 'monthly'),
-            ('/features/motion-presets/', '0.7', 'monthly'),
-            ('/features/export-formats/', '0.7', 'monthly'),
-            ('/api/docs/', '0.6', 'monthly'),
-            ('/terms/', '0.3', 'yearly'),
-            ('/privacy/', '0.3', 'yearly'),
-        ]
-
-        xml = '<?xml version="1.0" encoding="UTF-8"?>\n'
-        xml += '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-
-        for url, priority, changefreq in urls:
-            xml += '  <url>\n'
-            xml += f'    <loc>{domain}{url}</loc>\n'
-            xml += f'    <priority>{priority}</priority>\n'
-            xml += f'    <changefreq>{changefreq}</changefreq>\n'
-            xml += '  </url>\n'
-
-        xml += '</urlset>'
-
-        return HttpResponse(xml, content_type='application/xml')
-
-
-class RobotsTxtView(View):
-    def get(self, request):
-        content = f"""# robots.txt for {config.PROJECT_NAME}
+SITEMAP_URLS = [
+    ('', '1.0', 'weekly'),
+    ('/how-it-works/', '0.9', 'monthly'),
+    ('/examples/', '0.9', 'weekly'),
+    ('/pricing/', '0.9', 'weekly'),
+    ('/tutorials/', '0.8', 'monthly'),
+    ('/faq/', '0.8', 'monthly'),
+    ('/about/', '0.7', 'monthly'),
+    ('/contact/', '0.6', 'monthly'),
+    ('/for/content-creators/', '0.8', 'monthly'),
+    ('/for/educators/', '0.8', 'monthly'),
+    ('/for/game-developers/', '0.8', 'monthly'),
+    ('/for/artists/', '0.8', 'monthly'),
+    ('/features/ai-pose-detection/', '0.7', 'monthly'),
+    ('/features/motion-presets/', '0.7', 'monthly'),
+    ('/features/export-formats/', '0.7', 'monthly'),
+    ('/api/docs/', '0.6', 'monthly'),
+    ('/terms/', '0.3', 'yearly'),
+    ('/privacy/', '0.3', 'yearly'),
+]
+
+
+def _build_sitemap_xml():
+    domain = f"https://{config.PROJECT_DOMAIN}"
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n',
+    ]
+
+    for url, priority, changefreq in SITEMAP_URLS:
+        parts.append(
+            '  <url>\n'
+            f'    <loc>{domain}{url}</loc>\n'
+            f'    <priority>{priority}</priority>\n'
+            f'    <changefreq>{changefreq}</changefreq>\n'
+            '  </url>\n'
+        )
+
+    parts.append('</urlset>')
+    return ''.join(parts)
+
+
+# Both only depend on config, so they're built once at import
+SITEMAP_XML = _build_sitemap_xml().encode()
+
+ROBOTS_TXT = f"""# robots.txt for {config.PROJECT_NAME}
 # https://{config.PROJECT_DOMAIN}
 
 User-agent: *
@@ -817,5 +746,16 @@ Sitemap: https://{config.PROJECT_DOMAIN}/sitemap.xml
 
 # Crawl delay
 Crawl-delay: 1
-"""
-        return HttpResponse(content, content_type='text/plain')
+""".encode()
+
+
+@method_decorator(cache_control(public=True, max_age=60 * 60 * 24 * 3), name='get')
+class SitemapView(View):
+    def get(self, request):
+        return HttpResponse(SITEMAP_XML, content_type='application/xml')
+
+
+@method_decorator(cache_control(public=True, max_age=60 * 60 * 24 * 3), name='get')
+class RobotsTxtView(View):
+    def get(self, request):
+        return HttpResponse(ROBOTS_TXT, content_type='text/plain')
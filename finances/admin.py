@@ -55,8 +55,11 @@ class PaymentAdmin(admin.ModelAdmin):
         'status',
         'created_at'
     )
+    # user is nullable, so the changelist won't join it on its own
+    list_select_related = ('user',)
+    # Exact match so the search uses the uuid index instead of LIKE '%q%'
     search_fields = (
-        'uuid',
+        '=uuid',
     )
 
 
@@ -15,8 +15,10 @@ Credit System:
 
 Run with: python manage.py setup_pricing
 """
+from django.core.cache import cache
 from django.core.management.base import BaseCommand
-from finances.models.plan import Plan
+from django.db import transaction
+from finances.models.plan import Plan, PLANS_BY_PRICE_CACHE_KEY
 
 
 DEFAULT_PLANS = [
@@ -305,29 +307,40 @@ class Command(BaseCommand):
             deleted_count = Plan.objects.all().delete()[0]
             self.stdout.write(self.style.WARNING(f'Deleted {deleted_count} existing plans'))
 
-        created_count = 0
-        updated_count = 0
+        # One lookup for every plan, then one bulk write per kind of change
+        existing = Plan.objects.in_bulk([p['code_name'] for p in DEFAULT_PLANS], field_name='code_name')
+        to_create = []
+        to_update = []
         skipped_count = 0
 
         for plan_data in DEFAULT_PLANS:
-            code_name = plan_data['code_name']
-            existing = Plan.objects.filter(code_name=code_name).first()
+            plan = existing.get(plan_data['code_name'])
 
-            if existing:
+            if plan:
                 if force:
                     for key, value in plan_data.items():
-                        setattr(existing, key, value)
-                    existing.save()
-                    updated_count += 1
+                        setattr(plan, key, value)
+                    to_update.append(plan)
                     self.stdout.write(self.style.WARNING(f'Updated: {plan_data["name"]}'))
                 else:
                     skipped_count += 1
                     self.stdout.write(f'Skipped (exists): {plan_data["name"]}')
             else:
-                Plan.objects.create(**plan_data)
-                created_count += 1
+                to_create.append(Plan(**plan_data))
                 self.stdout.write(self.style.SUCCESS(f'Created: {plan_data["name"]}'))
 
+        fields = sorted({key for plan_data in DEFAULT_PLANS for key in plan_data} - {'code_name'})
+        with transaction.atomic():
+            Plan.objects.bulk_create(to_create)
+            Plan.objects.bulk_update(to_update, fields)
+
+        # Bulk writes skip the post_save receiver that drops the cached list
+        if to_create or to_update:
+            cache.delete(PLANS_BY_PRICE_CACHE_KEY)
+
+        created_count = len(to_create)
+        updated_count = len(to_update)
+
         self.stdout.write('')
         self.stdout.write(self.style.SUCCESS(
             f'Summary: {created_count} created, {updated_count} updated, {skipped_count} skipped'
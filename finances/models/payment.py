@@ -55,7 +55,7 @@ class Payment(models.Model):
     used_card_exp_month = models.CharField(max_length=50, null=True, blank=True)
     used_card_exp_year = models.CharField(max_length=50, null=True, blank=True)
     used_card_last_digits = models.CharField(max_length=50, null=True, blank=True)
-    uuid = models.CharField(default=Utils.generate_hex_uuid, max_length=250)
+    uuid = models.CharField(default=Utils.generate_hex_uuid, max_length=250, db_index=True)
     created_at = models.DateTimeField(default=timezone.now)
 
     def __str__(self):
@@ -1,10 +1,16 @@
 import requests
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.utils.text import slugify
 
 from config import PAYPAL_KEYS
 
 
+PLANS_BY_PRICE_CACHE_KEY = 'finances:plans:by_price'
+
+
 class Plan(models.Model):
     # Display info
     name = models.CharField(max_length=100, help_text='Display name (e.g., "Creator Plan")')
@@ -58,6 +64,18 @@ class Plan(models.Model):
         self.code_name = slugify(self.code_name)
         super().save(*args, **kwargs)
 
+    @classmethod
+    def by_price(cls):
+        """All plans ordered by price, cached until one is saved or deleted."""
+        return cache.get_or_set(
+            PLANS_BY_PRICE_CACHE_KEY, lambda: list(cls.objects.order_by('price')), 300
+        )
+
+    @classmethod
+    def by_code_name(cls, code_name):
+        """The plan with code_name from the cached list, or None."""
+        return next((plan for plan in cls.by_price() if plan.code_name == code_name), None)
+
     @staticmethod
     def create_paypal_product():
         product_name = 'Services'
@@ -75,9 +93,9 @@ class Plan(models.Model):
         ).json()
 
         if r.get('id'):
-            for plan in Plan.objects.all():
-                plan.paypal_product_key = r.get('id')
-                plan.save()
+            # Same key on every plan, so one UPDATE; it skips post_save
+            Plan.objects.update(paypal_product_key=r.get('id'))
+            cache.delete(PLANS_BY_PRICE_CACHE_KEY)
 
             print('Product created')
         else:
@@ -89,7 +107,7 @@ class Plan(models.Model):
             is_subscription=True
         )
 
-        for plan in plans.filter():
+        for plan in plans:
             params = {
                 'product_id': plan.paypal_product_key,
                 'name': '%s credits' % plan.credits,
@@ -127,8 +145,13 @@ class Plan(models.Model):
 
             if r.get('id'):
                 plan.paypal_key = r.get('id')
-                plan.save()
+                plan.save(update_fields=['paypal_key'])
                 print('Plan created')
             else:
                 print(r)
                 print('Plan not created')
+
+
+@receiver([post_save, post_delete], sender=Plan)
+def _invalidate_plans_by_price(sender, instance, **kwargs):
+    cache.delete(PLANS_BY_PRICE_CACHE_KEY)
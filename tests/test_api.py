@@ -350,3 +350,53 @@ class ResendVerificationAPITest(APITestBase):
         )
         self.assertEqual(response.status_code, 200)
         mock_email.assert_called_once()
+
+
+class TranslationCacheTest(APITestBase):
+    """Test the per-language translation cache."""
+
+    def test_saved_translation_replaces_cached_text(self):
+        """Changing a translation is picked up by the next lookup."""
+        self.assertEqual(Translation.get_text_by_lang('en')['missing_email'], 'Email is required')
+
+        Translation.register_text_translated({
+            'language': 'en', 'code_name': 'missing_email', 'text': 'Enter your email',
+        })
+        self.assertEqual(Translation.get_text_by_lang('en')['missing_email'], 'Enter your email')
+
+    def test_bulk_replaced_text_replaces_cached_text(self):
+        """The replace_pdf command's bulk update is picked up by the next lookup."""
+        from io import StringIO
+        from django.core.management import call_command
+        Translation.objects.create(code_name='old_domain', language='en', text='Visit estacaido.com')
+        self.assertEqual(Translation.get_text_by_lang('en')['old_domain'], 'Visit estacaido.com')
+
+        with mock.patch('sys.stdout', new_callable=StringIO):
+            call_command('replace_pdf')
+        self.assertEqual(Translation.get_text_by_lang('en')['old_domain'], 'Visit animateadrawing.com')
+
+    def test_untranslated_language_falls_back_to_english(self):
+        """A language without texts uses the English ones."""
+        self.assertEqual(Translation.get_text_by_lang('xx'), Translation.get_text_by_lang('en'))
+
+
+class SetupPricingCommandTest(APITestBase):
+    """Test the setup_pricing management command."""
+
+    def test_creates_and_force_updates_plans(self):
+        """Missing plans are created, --force rewrites existing ones and drops the cached list."""
+        from io import StringIO
+        from django.core.management import call_command
+        from finances.management.commands.setup_pricing import DEFAULT_PLANS
+
+        Plan.objects.create(name='Old Free', code_name='free', price=0)
+        self.assertEqual(len(Plan.by_price()), 1)
+
+        call_command('setup_pricing', stdout=StringIO())
+        self.assertEqual(Plan.objects.count(), len(DEFAULT_PLANS))
+        self.assertEqual(Plan.objects.get(code_name='free').name, 'Old Free')
+        self.assertEqual(len(Plan.by_price()), len(DEFAULT_PLANS))
+
+        call_command('setup_pricing', '--force', stdout=StringIO())
+        self.assertEqual(Plan.objects.get(code_name='free').name, 'Free')
+        self.assertEqual(Plan.by_code_name('free').name, 'Free')
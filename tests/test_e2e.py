@@ -6,6 +6,7 @@ import json
 import struct
 import uuid
 import zlib
+from datetime import timedelta
 from unittest import mock
 
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -429,7 +430,8 @@ class CollaborationFlowTest(E2ETestBase):
     """
 
     @mock.patch('app.utils.Utils.send_email', return_value=1)
-    def test_collaboration_invite_flow(self, mock_email):
+    @mock.patch('animator.tasks.send_collaboration_email.delay')
+    def test_collaboration_invite_flow(self, mock_delay, mock_email):
         # Create two users
         user_a = CustomUser.objects.create_user(email='alice@example.com', password='pass1234')
         user_a.is_confirm = True
@@ -459,7 +461,14 @@ class CollaborationFlowTest(E2ETestBase):
             project=project, invited_email='bob@example.com'
         )
         self.assertFalse(invite.accepted)
-        mock_email.assert_called()
+        mock_delay.assert_called_once_with(str(invite.id), 'en')
+        mock_email.assert_not_called()
+
+        # The worker sends the email
+        from animator.tasks import send_collaboration_email
+        result = send_collaboration_email(str(invite.id), 'en')
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(mock_email.call_args.kwargs['recipients'], ['bob@example.com'])
 
         # Simulate accept: create collaborator record
         ProjectCollaborator.objects.create(
@@ -804,3 +813,73 @@ class CreditDeductionDuringExportTest(E2ETestBase):
 
         user.refresh_from_db()
         self.assertEqual(user.credits, 45)
+
+    def test_failed_render_refunds_reserved_credits(self):
+        """A render that raises gives back the credits it reserved."""
+        from animator.tasks import render_export
+
+        user = CustomUser.objects.create_user(email='refund@example.com', password='pass1234')
+        user.credits = 50
+        user.save()
+        project = Project.objects.create(user=user, name='Refund', duration_seconds=10.0)
+        export = Export.objects.create(project=project, format='mp4', quality='high')
+
+        with mock.patch('animator.services.renderer.AnimationRenderer.render', side_effect=RuntimeError('boom')):
+            result = render_export(str(export.id))
+
+        self.assertEqual(result['status'], 'error')
+        export.refresh_from_db()
+        user.refresh_from_db()
+        self.assertEqual(export.status, 'failed')
+        self.assertEqual(export.credits_reserved, 0)
+        self.assertEqual(user.credits, 50)
+
+    def test_cleanup_releases_stalled_reservation_once(self):
+        """A render whose worker died is failed and refunded by the cleanup job, once."""
+        from animator.tasks import cleanup_old_exports, release_export_credits
+
+        user = CustomUser.objects.create_user(email='stalled@example.com', password='pass1234')
+        user.credits = 20
+        user.save()
+        project = Project.objects.create(user=user, name='Stalled', duration_seconds=10.0)
+        export = Export.objects.create(
+            project=project, format='mp4', status='processing', credits_reserved=30,
+            started_at=timezone.now() - timedelta(hours=2),
+        )
+        fresh = Export.objects.create(
+            project=project, format='mp4', status='processing', credits_reserved=10, started_at=timezone.now(),
+        )
+
+        result = cleanup_old_exports()
+        self.assertEqual(result['credits_released'], 30)
+        self.assertEqual(release_export_credits(export.id), 0)
+
+        export.refresh_from_db()
+        fresh.refresh_from_db()
+        user.refresh_from_db()
+        self.assertEqual(export.status, 'failed')
+        self.assertEqual(export.credits_reserved, 0)
+        self.assertEqual(fresh.credits_reserved, 10)
+        self.assertEqual(user.credits, 50)
+
+    def test_cleanup_prunes_unused_palettes(self):
+        """Cached GIF palettes unused for longer than the max age are deleted."""
+        import os
+        import tempfile
+        import time
+        from animator.tasks import cleanup_old_exports
+
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            palette_dir = os.path.join(media_root, 'cache', 'palettes')
+            os.makedirs(palette_dir)
+            stale, fresh = os.path.join(palette_dir, 'stale.png'), os.path.join(palette_dir, 'fresh.png')
+            for path in (stale, fresh):
+                open(path, 'wb').close()
+            old = time.time() - 31 * 24 * 60 * 60
+            os.utime(stale, (old, old))
+
+            result = cleanup_old_exports()
+
+            self.assertEqual(result['palettes_deleted'], 1)
+            self.assertFalse(os.path.exists(stale))
+            self.assertTrue(os.path.exists(fresh))
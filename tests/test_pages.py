@@ -2,6 +2,8 @@
 Tests for all page loads: public pages, authenticated pages, and animator pages.
 Ensures every URL returns the expected status code.
 """
+import base64
+import json
 import uuid
 from io import BytesIO
 from unittest import mock
@@ -129,10 +131,25 @@ class PublicPageLoadTest(PageTestBase):
         response = self.client.get(reverse('pricing'))
         self.assertEqual(response.status_code, 200)
 
+    def test_pricing_page_shows_new_plan(self):
+        """The cached plan list picks up a plan created after it was built."""
+        self.client.get(reverse('pricing'))
+        Plan.objects.create(name='Starter', code_name='starter', price=9, credits=100, days=30)
+        response = self.client.get(reverse('pricing'))
+        self.assertEqual([plan.code_name for plan in response.context['plans']], ['starter'])
+
     def test_login_page(self):
         response = self.client.get(reverse('login'))
         self.assertEqual(response.status_code, 200)
 
+    def test_anonymous_page_creates_no_session(self):
+        """Only an explicit ?lang= choice is stored in the session."""
+        response = self.client.get(reverse('login'))
+        self.assertNotIn('sessionid', response.cookies)
+        response = self.client.get(reverse('login') + '?lang=en')
+        self.assertIn('sessionid', response.cookies)
+        self.assertEqual(self.client.session['lang'], 'en')
+
     def test_register_page(self):
         response = self.client.get(reverse('register'))
         self.assertEqual(response.status_code, 200)
@@ -158,6 +175,7 @@ class PublicPageLoadTest(PageTestBase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['Content-Type'], 'application/xml')
         self.assertIn(b'<urlset', response.content)
+        self.assertIn('public', response['Cache-Control'])
 
     def test_robots_txt(self):
         response = self.client.get(reverse('robots'))
@@ -165,6 +183,35 @@ class PublicPageLoadTest(PageTestBase):
         self.assertEqual(response['Content-Type'], 'text/plain')
         self.assertIn(b'User-agent', response.content)
 
+    def test_static_page_cached_for_anonymous(self):
+        """Anonymous visitors get a static page's HTML from the cache."""
+        from django.core.cache import cache
+        cache.clear()
+        first = self.client.get(reverse('faq'))
+        with mock.patch('core.views.render_to_string') as mock_render:
+            second = self.client.get(reverse('faq'))
+        mock_render.assert_not_called()
+        self.assertEqual(first.content, second.content)
+
+    def test_static_page_not_cached_for_logged_in(self):
+        """Logged-in users get their own account menu, not the cached page."""
+        from django.core.cache import cache
+        cache.clear()
+        self.client.get(reverse('faq'))
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('faq'))
+        self.assertContains(response, 'pagetest@')
+
+    def test_static_page_cached_per_scheme(self):
+        """An https request doesn't reuse the page cached for http, whose links differ."""
+        from django.core.cache import cache
+        cache.clear()
+        self.client.get(reverse('faq'))
+        with mock.patch('core.views.render_to_string', return_value='https page') as mock_render:
+            response = self.client.get(reverse('faq'), secure=True)
+        mock_render.assert_called_once()
+        self.assertEqual(response.content, b'https page')
+
     def test_api_docs_page(self):
         response = self.client.get(reverse('api-docs'))
         self.assertEqual(response.status_code, 200)
@@ -214,6 +261,53 @@ class AuthenticatedPageLoadTest(PageTestBase):
         response = self.client.get(reverse('account'))
         self.assertEqual(response.status_code, 200)
 
+    def test_account_page_payment_history(self):
+        """The payment history is read in one query without the processor payloads."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from finances.models.payment import Payment
+        for amount in (5, 10, 20):
+            Payment.objects.create(user=self.user, processor='stripe', amount=amount, status='success',
+                                   payment_data='{"raw": "payload"}')
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('account'))
+        self.assertContains(response, 'US$ 20.00')
+        payment_queries = [q['sql'] for q in queries.captured_queries if 'finances_payment' in q['sql']]
+        self.assertEqual(len(payment_queries), 1)
+        self.assertNotIn('payment_data', payment_queries[0])
+
+    def test_account_page_payment_history_pages(self):
+        """The payment history shows 20 rows a page, newest first."""
+        from finances.models.payment import Payment
+        for amount in range(1, 23):
+            Payment.objects.create(user=self.user, processor='stripe', amount=amount, status='success')
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('account'))
+        payments = response.context['payments']
+        self.assertEqual(len(payments), 20)
+        self.assertTrue(payments.has_next())
+        self.assertContains(response, '?page=2')
+        response = self.client.get(reverse('account') + '?page=2')
+        self.assertEqual([p.amount for p in response.context['payments']], [2, 1])
+
+    def test_account_page_shows_subscribed_plan(self):
+        """The account page finds the user's plan by its code name."""
+        plan = Plan.objects.create(name='Creator', code_name='creator', price=19, credits=500)
+        self.user.plan_subscribed = 'creator'
+        self.user.save()
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('account'))
+        self.assertEqual(response.context['plan_subscribed'], plan)
+
+    def test_restore_password_page_issues_token(self):
+        """A logged-in user opening restore password gets a new token."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('restore-password'))
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(response.context['token'], self.user.restore_password_token)
+
     def test_verify_page_unverified(self):
         """Unverified user sees the verify page."""
         self.user.is_confirm = False
@@ -260,6 +354,14 @@ class AuthRedirectTest(PageTestBase):
         response = self.client.get(reverse('account'))
         self.assertEqual(response.status_code, 302)
 
+    def test_unconfirmed_checkout_redirects_to_verify(self):
+        """A logged-in user without a confirmed email is sent to verify."""
+        self.user.is_confirm = False
+        self.user.save()
+        self.client.force_login(self.user)
+        response = self.client.post(reverse('checkout'), {'plan': 'starter'})
+        self.assertRedirects(response, reverse('verify'), fetch_redirect_response=False)
+
     def test_cancel_redirects(self):
         response = self.client.get(reverse('cancel'))
         self.assertEqual(response.status_code, 302)
@@ -422,6 +524,7 @@ class AnimatorPageLoadTest(PageTestBase):
         )
         self.assertEqual(response.status_code, 302)
         self.assertEqual(self.project.scenes.count(), 2)
+        self.assertEqual(self.project.scenes.get(name='Scene 2').order, self.scene.order + 1)
 
     def test_scene_editor(self):
         response = self.client.get(
@@ -462,6 +565,34 @@ class AnimatorPageLoadTest(PageTestBase):
         )
         self.assertEqual(response.status_code, 200)
 
+    def _complete_export(self):
+        self.export.status = 'completed'
+        self.export.output_file = SimpleUploadedFile('out.mp4', b'video bytes')
+        self.export.save()
+
+    def test_export_download(self):
+        self._complete_export()
+        response = self.client.get(
+            reverse('animator:export_download', kwargs={'export_id': self.export.id})
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'video bytes')
+        self.assertIn('Test Project.mp4', response['Content-Disposition'])
+
+    @override_settings(EXPORT_X_ACCEL_REDIRECT='/protected-uploads/')
+    def test_export_download_x_accel(self):
+        """With EXPORT_X_ACCEL_REDIRECT set, nginx is told to send the file."""
+        self._complete_export()
+        response = self.client.get(
+            reverse('animator:export_download', kwargs={'export_id': self.export.id})
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(
+            response['X-Accel-Redirect'], '/protected-uploads/' + self.export.output_file.name
+        )
+        self.assertIn('attachment', response['Content-Disposition'])
+
     def test_motion_preset_list_public(self):
         """Motion preset list is publicly accessible."""
         self.client.logout()
@@ -550,6 +681,38 @@ class AnimatorAccessControlTest(PageTestBase):
         )
         self.assertEqual(response.status_code, 404)
 
+    def test_collaborator_can_view_project(self):
+        """A collaborator on another user's project can open it."""
+        from animator.models import ProjectCollaborator
+        ProjectCollaborator.objects.create(project=self.other_project, user=self.user)
+        response = self.client.get(
+            reverse('animator:project_detail', kwargs={'project_id': self.other_project.id})
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_dashboard_lists_collaborated_project(self):
+        """The dashboard's recent projects include ones the user collaborates on."""
+        from animator.models import ProjectCollaborator
+        ProjectCollaborator.objects.create(project=self.other_project, user=self.user)
+        response = self.client.get(reverse('animator:dashboard'))
+        self.assertIn(self.other_project, response.context['projects'])
+
+    @mock.patch('animator.tasks.send_collaboration_email.delay')
+    def test_collaborator_cannot_invite(self, mock_delay):
+        """Only the owner can invite; a collaborator is sent back to the list."""
+        from animator.models import ProjectCollaborator, CollaborationInvite
+        ProjectCollaborator.objects.create(project=self.other_project, user=self.user)
+        response = self.client.post(
+            reverse('animator:collaborator_invite', kwargs={'project_id': self.other_project.id}),
+            {'email': 'friend@example.com'}
+        )
+        self.assertRedirects(
+            response, reverse('animator:collaborator_list', kwargs={'project_id': self.other_project.id}),
+            fetch_redirect_response=False
+        )
+        self.assertFalse(CollaborationInvite.objects.exists())
+        mock_delay.assert_not_called()
+
 
 class AnimatorAPIEndpointTest(PageTestBase):
     """Test animator JSON API endpoints."""
@@ -644,6 +807,24 @@ class AnimatorAPIEndpointTest(PageTestBase):
         self.assertEqual(self.scene.background_color, '#FF0000')
         self.assertAlmostEqual(self.scene.camera_zoom, 1.5)
 
+    def test_api_save_scene_zero_zoom(self):
+        """A zero zoom is clamped on save and still renders."""
+        import numpy as np
+        from animator.services.renderer import AnimationRenderer
+        self.client.post(
+            reverse('animator:api_save_scene', kwargs={'scene_id': self.scene.id}),
+            data=json.dumps({'camera': {'zoom': 0}}),
+            content_type='application/json',
+        )
+        self.scene.refresh_from_db()
+        self.assertEqual(self.scene.camera_zoom, Scene.MIN_CAMERA_ZOOM)
+
+        # Rows saved before the clamp can still hold 0
+        self.scene.camera_zoom = 0
+        canvas = np.zeros((self.project.height, self.project.width, 3), dtype=np.uint8)
+        frame = AnimationRenderer(self.project)._apply_camera(canvas, self.scene)
+        self.assertEqual(frame.shape, canvas.shape)
+
     @mock.patch('animator.tasks.generate_motion_from_prompt.delay')
     def test_api_generate_animation(self, mock_task):
         """POST to generate animation queues the task."""
@@ -678,6 +859,60 @@ class AnimatorAPIEndpointTest(PageTestBase):
         data = response.json()
         self.assertEqual(data['status'], 'completed')
 
+    def test_api_export_status_not_modified(self):
+        """Polling with the last ETag gets a 304 until progress changes."""
+        url = reverse('animator:api_export_status', kwargs={'export_id': self.export.id})
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        Export.objects.filter(id=self.export.id).update(progress=50)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_api_project_data_not_modified(self):
+        """Project data is 304 until something in the project changes."""
+        url = reverse('animator:api_project_data', kwargs={'project_id': self.project.id})
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.character.name = 'Renamed'
+        self.character.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['characters'][0]['name'], 'Renamed')
+
+    def test_api_scene_data_not_modified(self):
+        """Scene data is 304 until a character is placed, moved or removed, however it's written."""
+        from animator.models import SceneCharacter
+        url = reverse('animator:api_scene_data', kwargs={'scene_id': self.scene.id})
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        sc = SceneCharacter.objects.create(scene=self.scene, character=self.character)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['characters']), 1)
+
+        etag = response['ETag']
+        sc.position_x = 40
+        sc.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['characters'][0]['position']['x'], 40)
+
+        etag = response['ETag']
+        sc.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['characters'], [])
+
+    def test_api_scene_data_etag_requires_access(self):
+        """Another user's scene is a 404 even with a matching ETag."""
+        url = reverse('animator:api_scene_data', kwargs={'scene_id': self.scene.id})
+        etag = self.client.get(url)['ETag']
+        other = CustomUser.objects.create_user(email='etag@example.com', password='pass1234')
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 404)
+
     @mock.patch('animator.tasks.render_preview_frame.delay')
     def test_api_render_preview(self, mock_task):
         """POST to render preview queues the task."""
@@ -694,6 +929,59 @@ class AnimatorAPIEndpointTest(PageTestBase):
         data = response.json()
         self.assertEqual(data['status'], 'processing')
 
+    @mock.patch('animator.tasks.render_preview_frame.delay')
+    def test_api_render_preview_cached(self, mock_task):
+        """A recently rendered preview frame is returned without queueing."""
+        from django.core.cache import cache
+        from animator.tasks import preview_cache_key
+        from animator.views import _scene_stamp
+        version = _scene_stamp(self.user, self.scene.id)
+        cache.set(preview_cache_key(self.scene.id, version, 3), b'\x89PNG', 60)
+        response = self.client.post(
+            reverse('animator:api_render_preview'),
+            data=json.dumps({
+                'scene_id': str(self.scene.id),
+                'frame': 3,
+            }),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['status'], 'success')
+        self.assertEqual(base64.b64decode(data['frame_b64']), b'\x89PNG')
+        mock_task.assert_not_called()
+
+    @mock.patch('animator.tasks.render_preview_frame.delay')
+    def test_api_render_preview_cache_invalidated_by_save(self, mock_task):
+        """Saving the scene makes its cached preview frames stale."""
+        from django.core.cache import cache
+        from animator.tasks import preview_cache_key
+        from animator.views import _scene_stamp
+        mock_task.return_value = mock.Mock(id='preview-456')
+        version = _scene_stamp(self.user, self.scene.id)
+        cache.set(preview_cache_key(self.scene.id, version, 3), b'\x89PNG', 60)
+
+        self.client.post(
+            reverse('animator:api_save_scene', kwargs={'scene_id': self.scene.id}),
+            data=json.dumps({'background_color': '#000000'}), content_type='application/json',
+        )
+        response = self.client.post(
+            reverse('animator:api_render_preview'),
+            data=json.dumps({'scene_id': str(self.scene.id), 'frame': 3}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.json()['status'], 'processing')
+        mock_task.assert_called_once_with(str(self.scene.id), 3, _scene_stamp(self.user, self.scene.id))
+
+
+    def test_render_preview_frame_without_version(self):
+        """Jobs queued before versioned keys still render, without caching."""
+        from animator.tasks import render_preview_frame
+        with mock.patch('animator.services.renderer.AnimationRenderer.render_frame_png',
+                        return_value=b'\x89PNG'), mock.patch('animator.tasks.cache') as mock_cache:
+            result = render_preview_frame(str(self.scene.id), 0)
+        self.assertEqual(result['status'], 'success')
+        mock_cache.set.assert_not_called()
 
 class PaginationAndFilterTest(PageTestBase):
     """Test pagination and filtering on project list."""
@@ -718,6 +1006,26 @@ class PaginationAndFilterTest(PageTestBase):
         response2 = self.client.get(reverse('animator:project_list'), {'page': 2})
         self.assertEqual(response2.status_code, 200)
 
+    def test_project_list_pages_without_count(self):
+        """Project list pages are sliced without a COUNT query."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('animator:project_list'), {'page': 2})
+        page = response.context['projects']
+        self.assertEqual(len(page), 3)
+        self.assertTrue(page.has_previous())
+        self.assertFalse(page.has_next())
+        self.assertFalse(any(
+            q['sql'].startswith('SELECT COUNT(') and 'FROM "animator_project"' in q['sql']
+            for q in queries.captured_queries
+        ))
+
+        page = self.client.get(reverse('animator:project_list'), {'page': 'x'}).context['projects']
+        self.assertEqual(page.number, 1)
+        self.assertTrue(page.has_next())
+
     def test_project_list_filter_type(self):
         """Project list can filter by type."""
         response = self.client.get(reverse('animator:project_list'), {'type': 'quick'})
@@ -737,3 +1045,10 @@ class PaginationAndFilterTest(PageTestBase):
             reverse('animator:motion_preset_list'), {'category': 'locomotion'}
         )
         self.assertEqual(response.status_code, 200)
+
+    def test_motion_preset_list_shows_new_system_preset(self):
+        """Saving a system preset invalidates the cached system preset list."""
+        self.client.get(reverse('animator:motion_preset_list'))
+        MotionPreset.objects.create(name='Cartwheel', category='action', is_system=True)
+        response = self.client.get(reverse('animator:motion_preset_list'))
+        self.assertContains(response, 'Cartwheel')
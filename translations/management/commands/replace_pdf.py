@@ -17,13 +17,13 @@ class Command(BaseCommand):
 
         for old, new in old_domains:
             # Update Translation objects
-            variables = Translation.objects.filter(text__contains=old)
-            count = variables.count()
-            if count:
-                print(f'Replacing {count} Translation entries: {old} -> {new}')
+            variables = list(Translation.objects.filter(text__contains=old))
+            if variables:
+                print(f'Replacing {len(variables)} Translation entries: {old} -> {new}')
                 for v in variables:
                     v.text = v.text.replace(old, new)
-                    v.save()
+                Translation.objects.bulk_update(variables, ['text'], batch_size=500)
+                Translation.clear_cache(v.language for v in variables)
 
             # Update TextBase objects
             variables = TextBase.objects.filter(text__contains=old)
@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.core.cache import cache
 
 
 class Translation(models.Model):
@@ -13,15 +16,25 @@ class Translation(models.Model):
         return self.code_name
 
     @staticmethod
-    def get_text_by_lang(lang):
-        i18n = {}
-        text = Translation.objects.filter(language=lang)
+    def cache_key(lang):
+        return f'i18n:{lang}'
 
-        if not text:
-            text = Translation.objects.filter(language='en')
+    @staticmethod
+    def clear_cache(languages):
+        # Signals cover single saves and deletes, bulk writes must call this
+        cache.delete_many([Translation.cache_key(lang) for lang in set(languages)])
 
-        for i in text:
-            i18n[i.code_name] = i.text
+    @staticmethod
+    def get_text_by_lang(lang):
+        # Every page needs the full dict, so it's cached per language and
+        # dropped whenever one of that language's texts changes
+        i18n = cache.get(Translation.cache_key(lang))
+        if i18n is None:
+            i18n = dict(Translation.objects.filter(language=lang).values_list('code_name', 'text'))
+            cache.set(Translation.cache_key(lang), i18n)
+
+        if not i18n and lang != 'en':
+            return Translation.get_text_by_lang('en')
 
         return i18n
 
@@ -43,3 +56,8 @@ class Translation(models.Model):
         translation.save()
 
         return translation, 'ok'
+
+
+@receiver([post_save, post_delete], sender=Translation)
+def _invalidate_translations(sender, instance, **kwargs):
+    Translation.clear_cache([instance.language])